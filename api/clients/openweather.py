@@ -1,12 +1,38 @@
-from datetime import date, datetime
+import time
+from datetime import date, datetime, timedelta
 from typing import Literal, Optional, Union
 
 import httpx
+import orjson
+
+from api.clients.response_cache import ResponseCache
 
 BASE_URL = "https://api.openweathermap.org"
 
+# Shared keepalive pool for the async client so concurrent fan-outs reuse one
+# TCP+TLS connection (multiplexed over HTTP/2) instead of re-handshaking.
+ASYNC_LIMITS = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# The sync client is driven one request at a time, so a small warm pool is
+# enough to keep the TLS session alive across a job's consecutive calls.
+SYNC_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
 Units = Literal["standard", "metric", "imperial"]
 
+# Age after which a Time Machine reading is treated as final and cacheable.
+_FINAL_AFTER_SECONDS = 24 * 60 * 60
+
+
+def _is_closed_day(day: date) -> bool:
+    """True once *day* is over in every timezone, so its data is final."""
+    return day < date.today() - timedelta(days=1)
+
+
+def _is_final_time(timestamp: int) -> bool:
+    """True once the hour at Unix *timestamp* is more than a day old, after
+    which Time Machine no longer revises it."""
+    return timestamp < time.time() - _FINAL_AFTER_SECONDS
+
 
 class OpenWeatherError(Exception):
     """Raised when the OpenWeatherMap API returns an error response."""
@@ -28,13 +54,20 @@ class OpenWeatherClient:
         api_key: str,
         units: Units = "metric",
         timeout: float = 10.0,
+        cache_path: Optional[str] = None,
     ) -> None:
         self.api_key = api_key
         self.units = units
-        self._client = httpx.Client(
-            base_url=BASE_URL,
-            timeout=timeout,
-            params={"appid": api_key, "units": units},
+        self.timeout = timeout
+        # Both pools are created on first use, so a client that only ever
+        # makes async calls (or only sync ones) never opens the other.
+        self._client: Optional[httpx.Client] = None
+        # The async pool is also bound to the event loop it first runs on,
+        # and ETL jobs each drive their own ``asyncio.run``.
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # Optional on-disk store for responses that can no longer change.
+        self._cache: Optional[ResponseCache] = (
+            ResponseCache(cache_path) if cache_path else None
         )
 
     # ------------------------------------------------------------------
@@ -47,15 +80,82 @@ class OpenWeatherClient:
         Raises:
             OpenWeatherError: on any non-2xx HTTP status.
         """
+        if self._client is None:
+            self._client = httpx.Client(
+                base_url=BASE_URL,
+                timeout=self.timeout,
+                params={"appid": self.api_key, "units": self.units},
+                http2=True,
+                limits=SYNC_LIMITS,
+            )
         response = self._client.get(path, params={k: v for k, v in params.items() if v is not None})
         if not response.is_success:
             detail = response.json().get("message", response.text)
             raise OpenWeatherError(response.status_code, detail)
-        return response.json()
+        return orjson.loads(response.content)
+
+    async def _aget(self, path: str, **params) -> dict:
+        """Async twin of :meth:`_get`.
+
+        Raises:
+            OpenWeatherError: on any non-2xx HTTP status.
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                timeout=self.timeout,
+                params={"appid": self.api_key, "units": self.units},
+                http2=True,
+                limits=ASYNC_LIMITS,
+            )
+        response = await self._async_client.get(
+            path, params={k: v for k, v in params.items() if v is not None}
+        )
+        if not response.is_success:
+            detail = response.json().get("message", response.text)
+            raise OpenWeatherError(response.status_code, detail)
+        return orjson.loads(response.content)
+
+    def _get_final(self, path: str, **params) -> dict:
+        """:meth:`_get` for immutable responses, served from the disk cache."""
+        if self._cache is None:
+            return self._get(path, **params)
+        key = ResponseCache.make_key(path, units=self.units, **params)
+        body = self._cache.get(key)
+        if body is None:
+            body = self._get(path, **params)
+            self._cache.set(key, body)
+        return body
+
+    async def _aget_final(self, path: str, **params) -> dict:
+        """Async twin of :meth:`_get_final`."""
+        if self._cache is None:
+            return await self._aget(path, **params)
+        key = ResponseCache.make_key(path, units=self.units, **params)
+        body = self._cache.get(key)
+        if body is None:
+            body = await self._aget(path, **params)
+            self._cache.set(key, body)
+        return body
 
     def close(self) -> None:
-        """Close the underlying HTTP connection pool."""
-        self._client.close()
+        """Close the sync HTTP connection pool, if one was opened, and the response cache."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    async def aclose(self) -> None:
+        """Close the async connection pool, if one was opened.
+
+        The client stays usable afterwards; the next async call opens a fresh
+        pool on whichever event loop is running at the time.
+        """
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
     def __enter__(self) -> "OpenWeatherClient":
         return self
@@ -63,6 +163,12 @@ class OpenWeatherClient:
     def __exit__(self, *_) -> None:
         self.close()
 
+    async def __aenter__(self) -> "OpenWeatherClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
     # ------------------------------------------------------------------
     # Current weather
     # ------------------------------------------------------------------
@@ -70,6 +176,9 @@ class OpenWeatherClient:
     def get_current_weather(self, lat: float, lon: float) -> dict:
         return self._get("/data/2.5/weather", lat=lat, lon=lon)
 
+    async def aget_current_weather(self, lat: float, lon: float) -> dict:
+        return await self._aget("/data/2.5/weather", lat=lat, lon=lon)
+
     # ------------------------------------------------------------------
     # One Call 3.0 — requires "One Call by Call" subscription
     # ------------------------------------------------------------------
@@ -81,7 +190,8 @@ class OpenWeatherClient:
         day: date,
         tz: Optional[str] = None,
     ) -> dict:
-        return self._get(
+        get = self._get_final if _is_closed_day(day) else self._get
+        return get(
             "/data/3.0/onecall/day_summary",
             lat=lat,
             lon=lon,
@@ -107,7 +217,24 @@ class OpenWeatherClient:
             The parsed JSON response from the Time Machine endpoint.
         """
         timestamp = int(dt.timestamp()) if isinstance(dt, datetime) else dt
-        return self._get(
+        get = self._get_final if _is_final_time(timestamp) else self._get
+        return get(
+            "/data/3.0/onecall/timemachine",
+            lat=lat,
+            lon=lon,
+            dt=timestamp,
+        )
+
+    async def aget_timemachine(
+        self,
+        lat: float,
+        lon: float,
+        dt: Union[datetime, int],
+    ) -> dict:
+        """Async twin of :meth:`get_timemachine`."""
+        timestamp = int(dt.timestamp()) if isinstance(dt, datetime) else dt
+        aget = self._aget_final if _is_final_time(timestamp) else self._aget
+        return await aget(
             "/data/3.0/onecall/timemachine",
             lat=lat,
             lon=lon,
@@ -121,7 +248,24 @@ class OpenWeatherClient:
         day: date,
         interval: str = "15m",
     ) -> dict:
-        return self._get(
+        get = self._get_final if _is_closed_day(day) else self._get
+        return get(
+            "/energy/2.0/solar/interval_data",
+            lat=lat,
+            lon=lon,
+            interval=interval,
+            date=day.isoformat(),
+        )
+
+    async def aget_solar_irradiance(
+        self,
+        lat: float,
+        lon: float,
+        day: date,
+        interval: str = "15m",
+    ) -> dict:
+        aget = self._aget_final if _is_closed_day(day) else self._aget
+        return await aget(
             "/energy/2.0/solar/interval_data",
             lat=lat,
             lon=lon,
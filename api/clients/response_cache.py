@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+
+class ResponseCache:
+    """Persistent key → JSON body store backed by a single SQLite file.
+
+    Intended for upstream responses that can never change (e.g. weather for a
+    day that has already finished), so entries are kept indefinitely.  A hit is
+    one primary-key lookup instead of an HTTPS round-trip.
+
+    The connection is shared across threads behind a lock; every statement is
+    tiny, so contention is negligible next to the network calls it replaces.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(path: str, **params) -> str:
+        """Build a stable key from a request path and its (non-None) params."""
+        return json.dumps(
+            [path, sorted((k, v) for k, v in params.items() if v is not None)],
+            separators=(",", ":"),
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return orjson.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, body: dict) -> None:
+        payload = orjson.dumps(body).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body) VALUES (?, ?)",
+                (key, payload),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -6,9 +6,19 @@ load_dotenv()
 class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production")
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///zendo_dev.db")
+    # Relative SQLite file URLs are resolved under this directory.
+    INSTANCE_DIR: str = os.getenv("INSTANCE_DIR", "/tmp/zendo/instance")
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "")
     BACKFILL_START_DATE: str = os.getenv("BACKFILL_START_DATE", "2026-02-22")
+    # Days whose ETL runs concurrently during the startup backfill.
+    BACKFILL_CONCURRENCY: int = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+    # AnyIO worker threads shared by sync route handlers and to_thread calls.
+    THREADPOOL_TOKENS: int = int(os.getenv("THREADPOOL_TOKENS", "64"))
+    # On-disk cache for finalised OpenWeather responses; empty disables it.
+    OPENWEATHER_CACHE_PATH: str = os.getenv("OPENWEATHER_CACHE_PATH", "/tmp/zendo/cache/openweather.db")
+    # How long a SQLite connection waits on a locked database before SQLITE_BUSY.
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
 
 settings = Settings()
@@ -1,19 +1,82 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
+from typing import Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Float, Row, column, func, literal, select, tuple_, union_all, values
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 
 from api.db.models import Consumption, Customer, Irradiance, Pearson, Production, Weather
-from api.db.session import get_session
+from api.db.session import get_readonly_session, get_session
+from lib.types import TimeSeries
+
+# Rows handed to each executemany call; bounds how much of a streamed
+# generator is held in memory at once.
+_UPSERT_CHUNK_ROWS = 5000
+
+
+@dataclass(frozen=True)
+class EnergySummaryRows:
+    """Everything the daily energy summary reads, fetched in one session."""
+
+    customer: Customer
+    production_sum: float
+    consumption_sum: float
+    latest_weather: Optional[Row]
+    latest_pearson: Optional[Row]
+
+
+@dataclass(frozen=True)
+class HistoricalSeries:
+    """The per-day series behind the historical endpoint, column-oriented,
+    plus the day's latest Pearson row (``None`` if absent or not requested).
+    """
+
+    production: TimeSeries
+    consumption: TimeSeries
+    weather: TimeSeries
+    irradiance: TimeSeries
+    latest_pearson: Optional[Row]
+
+
+def _upsert_chunked(
+    db: Session,
+    model: type,
+    rows: Iterable[dict],
+    index_elements: list[str],
+    update_cols: tuple[str, ...],
+) -> int:
+    """Upsert *rows* through one single-row statement, executemany'd.
+
+    The statement is compiled once and the driver reuses its prepared form
+    for every row; a multi-row VALUES statement instead has to be compiled
+    afresh for each chunk, which costs far more than the inserts themselves.
+
+    *rows* is consumed one chunk at a time, so a generator is never
+    materialised in full.  Returns the number of rows written.
+    """
+    stmt = sqlite_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={col: stmt.excluded[col] for col in update_cols},
+    )
+    rows = iter(rows)
+    total = 0
+    while chunk := list(islice(rows, _UPSERT_CHUNK_ROWS)):
+        db.execute(stmt, chunk)
+        total += len(chunk)
+    return total
 
 
 class DatabaseClient:
     """Typed interface for reading and writing Zendo time-series data.
 
     All methods open and close their own session using the shared
-    :func:`~db.session.get_session` context manager, so no session
+    :func:`~db.session.get_session` context manager (or
+    :func:`~db.session.get_readonly_session` for reads), so no session
     management is required by the caller.
     """
 
@@ -35,14 +98,14 @@ class DatabaseClient:
         return customer
 
     def get_customer(self, customer_id: int) -> Customer | None:
-        with get_session() as db:
+        with get_readonly_session() as db:
             customer = db.get(Customer, customer_id)
             if customer is not None:
                 db.expunge(customer)
         return customer
 
     def list_customers(self) -> list[Customer]:
-        with get_session() as db:
+        with get_readonly_session() as db:
             rows = db.execute(
                 select(Customer).order_by(Customer.customer_id)
             ).scalars().all()
@@ -77,15 +140,32 @@ class DatabaseClient:
             )
             db.execute(stmt)
 
-    def upsert_irradiance_bulk(self, rows: list[dict]) -> None:
-        if not rows:
-            return
+    def upsert_irradiance_bulk(self, rows: Iterable[dict]) -> int:
         with get_session() as db:
-            stmt = sqlite_insert(Irradiance).on_conflict_do_update(
+            return _upsert_chunked(
+                db, Irradiance, rows,
                 index_elements=["latitude", "longitude", "timestamp"],
-                set_={"irradiance": sqlite_insert(Irradiance).excluded.irradiance},
+                update_cols=("irradiance",),
             )
-            db.execute(stmt, rows)
+
+    @staticmethod
+    def _irradiance_series_stmt(
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime,
+    ):
+        # Core (timestamp, irradiance) rows — no ORM identity map or expunge.
+        return (
+            select(Irradiance.timestamp, Irradiance.irradiance)
+            .where(
+                Irradiance.latitude == lat,
+                Irradiance.longitude == lon,
+                Irradiance.timestamp >= start,
+                Irradiance.timestamp < end,
+            )
+            .order_by(Irradiance.timestamp)
+        )
 
     def get_irradiance_series(
         self,
@@ -93,21 +173,38 @@ class DatabaseClient:
         lon: float,
         start: datetime,
         end: datetime, # end is exclusive
-    ) -> list[Irradiance]:
-        with get_session() as db:
+    ) -> list[Row]:
+        with get_readonly_session() as db:
+            rows = db.execute(self._irradiance_series_stmt(lat, lon, start, end)).all()
+        return list(rows)
+
+    def get_irradiance_series_bulk(
+        self,
+        locations: Iterable[tuple[float, float]],
+        start: datetime,
+        end: datetime, # end is exclusive
+    ) -> dict[tuple[float, float], list[Row]]:
+        """Irradiance series for several locations in one query, keyed by (lat, lon).
+
+        Locations with no rows in the window are absent from the result.
+        """
+        pairs = list(set(locations))
+        if not pairs:
+            return {}
+        series: dict[tuple[float, float], list[Row]] = {}
+        with get_readonly_session() as db:
             rows = db.execute(
-                select(Irradiance)
+                select(*Irradiance.__table__.columns)
                 .where(
-                    Irradiance.latitude == lat,
-                    Irradiance.longitude == lon,
+                    tuple_(Irradiance.latitude, Irradiance.longitude).in_(pairs),
                     Irradiance.timestamp >= start,
                     Irradiance.timestamp < end,
                 )
-                .order_by(Irradiance.timestamp)
-            ).scalars().all()
+                .order_by(Irradiance.latitude, Irradiance.longitude, Irradiance.timestamp)
+            )
             for row in rows:
-                db.expunge(row)
-        return list(rows)
+                series.setdefault((row.latitude, row.longitude), []).append(row)
+        return series
 
     # ------------------------------------------------------------------
     # Consumption
@@ -130,35 +227,64 @@ class DatabaseClient:
             )
             db.execute(stmt)
 
-    def upsert_consumption_bulk(self, rows: list[dict]) -> None:
-        if not rows:
-            return
+    def upsert_consumption_bulk(self, rows: Iterable[dict]) -> int:
         with get_session() as db:
-            stmt = sqlite_insert(Consumption).on_conflict_do_update(
+            return _upsert_chunked(
+                db, Consumption, rows,
                 index_elements=["customer_id", "timestamp"],
-                set_={"power": sqlite_insert(Consumption).excluded.power},
+                update_cols=("power",),
             )
-            db.execute(stmt, rows)
+
+    @staticmethod
+    def _consumption_series_stmt(customer_id: int, start: datetime, end: datetime):
+        # Core (timestamp, power) rows — no ORM identity map or expunge.
+        return (
+            select(Consumption.timestamp, Consumption.power)
+            .where(
+                Consumption.customer_id == customer_id,
+                Consumption.timestamp >= start,
+                Consumption.timestamp < end,
+            )
+            .order_by(Consumption.timestamp)
+        )
 
     def get_consumption_series(
         self,
         customer_id: int,
         start: datetime,
         end: datetime, # end is exclusive
-    ) -> list[Consumption]:
-        with get_session() as db:
+    ) -> list[Row]:
+        with get_readonly_session() as db:
+            rows = db.execute(self._consumption_series_stmt(customer_id, start, end)).all()
+        return list(rows)
+
+    def get_consumption_series_bulk(
+        self,
+        customer_ids: Iterable[int],
+        start: datetime,
+        end: datetime, # end is exclusive
+    ) -> dict[int, list[Row]]:
+        """Consumption series for several customers in one query, keyed by customer_id.
+
+        Customers with no rows in the window are absent from the result.
+        """
+        ids = list(set(customer_ids))
+        if not ids:
+            return {}
+        series: dict[int, list[Row]] = {}
+        with get_readonly_session() as db:
             rows = db.execute(
-                select(Consumption)
+                select(Consumption.customer_id, Consumption.timestamp, Consumption.power)
                 .where(
-                    Consumption.customer_id == customer_id,
+                    Consumption.customer_id.in_(ids),
                     Consumption.timestamp >= start,
                     Consumption.timestamp < end,
                 )
-                .order_by(Consumption.timestamp)
-            ).scalars().all()
+                .order_by(Consumption.customer_id, Consumption.timestamp)
+            )
             for row in rows:
-                db.expunge(row)
-        return list(rows)
+                series.setdefault(row.customer_id, []).append(row)
+        return series
 
     # ------------------------------------------------------------------
     # Production
@@ -181,101 +307,139 @@ class DatabaseClient:
             )
             db.execute(stmt)
 
-    def upsert_production_bulk(self, rows: list[dict]) -> None:
-        if not rows:
-            return
+    def upsert_production_bulk(self, rows: Iterable[dict]) -> int:
         with get_session() as db:
-            stmt = sqlite_insert(Production).on_conflict_do_update(
+            return _upsert_chunked(
+                db, Production, rows,
                 index_elements=["customer_id", "timestamp"],
-                set_={"power": sqlite_insert(Production).excluded.power},
+                update_cols=("power",),
+            )
+
+    @staticmethod
+    def _production_series_stmt(customer_id: int, start: datetime, end: datetime):
+        # Core (timestamp, power) rows — no ORM identity map or expunge.
+        return (
+            select(Production.timestamp, Production.power)
+            .where(
+                Production.customer_id == customer_id,
+                Production.timestamp >= start,
+                Production.timestamp < end,
             )
-            db.execute(stmt, rows)
+            .order_by(Production.timestamp)
+        )
 
     def get_production_series(
         self,
         customer_id: int,
         start: datetime,
         end: datetime, # end is exclusive
-    ) -> list[Production]:
-        with get_session() as db:
+    ) -> list[Row]:
+        with get_readonly_session() as db:
+            rows = db.execute(self._production_series_stmt(customer_id, start, end)).all()
+        return list(rows)
+
+    def get_production_series_bulk(
+        self,
+        customer_ids: Iterable[int],
+        start: datetime,
+        end: datetime, # end is exclusive
+    ) -> dict[int, list[Row]]:
+        """Production series for several customers in one query, keyed by customer_id.
+
+        Customers with no rows in the window are absent from the result.
+        """
+        ids = list(set(customer_ids))
+        if not ids:
+            return {}
+        series: dict[int, list[Row]] = {}
+        with get_readonly_session() as db:
             rows = db.execute(
-                select(Production)
+                select(Production.customer_id, Production.timestamp, Production.power)
                 .where(
-                    Production.customer_id == customer_id,
+                    Production.customer_id.in_(ids),
                     Production.timestamp >= start,
                     Production.timestamp < end,
                 )
-                .order_by(Production.timestamp)
-            ).scalars().all()
+                .order_by(Production.customer_id, Production.timestamp)
+            )
             for row in rows:
-                db.expunge(row)
-        return list(rows)
+                series.setdefault(row.customer_id, []).append(row)
+        return series
 
     # ------------------------------------------------------------------
     # Pearson coefficients
     # ------------------------------------------------------------------
 
-    def upsert_pearson_bulk(self, rows: list[dict]) -> None:
-        if not rows:
-            return
+    def upsert_pearson_bulk(self, rows: Iterable[dict]) -> int:
         with get_session() as db:
-            stmt = sqlite_insert(Pearson).on_conflict_do_update(
+            return _upsert_chunked(
+                db, Pearson, rows,
                 index_elements=["customer_id", "timestamp"],
-                set_={
-                    "solar_irradiance_vs_production": sqlite_insert(Pearson).excluded.solar_irradiance_vs_production,
-                    "temperature_vs_consumption": sqlite_insert(Pearson).excluded.temperature_vs_consumption,
-                },
+                update_cols=("solar_irradiance_vs_production", "temperature_vs_consumption"),
             )
-            db.execute(stmt, rows)
 
     def get_pearson_series(
         self,
         customer_id: int,
         start: datetime,
         end: datetime, # end is exclusive
-    ) -> list[Pearson]:
-        with get_session() as db:
+    ) -> list[Row]:
+        with get_readonly_session() as db:
             rows = db.execute(
-                select(Pearson)
+                select(
+                    Pearson.timestamp,
+                    Pearson.solar_irradiance_vs_production,
+                    Pearson.temperature_vs_consumption,
+                )
                 .where(
                     Pearson.customer_id == customer_id,
                     Pearson.timestamp >= start,
                     Pearson.timestamp < end,
                 )
                 .order_by(Pearson.timestamp)
-            ).scalars().all()
-            for row in rows:
-                db.expunge(row)
+            ).all()
         return list(rows)
 
+    @staticmethod
+    def _latest_pearson_stmt(customer_id: int, start: datetime, end: datetime):
+        # Backward seek on the (customer_id, timestamp) primary key.
+        return (
+            select(
+                Pearson.timestamp,
+                Pearson.solar_irradiance_vs_production,
+                Pearson.temperature_vs_consumption,
+            )
+            .where(
+                Pearson.customer_id == customer_id,
+                Pearson.timestamp >= start,
+                Pearson.timestamp < end,
+            )
+            .order_by(Pearson.timestamp.desc())
+            .limit(1)
+        )
+
     # ------------------------------------------------------------------
     # Weather
     # ------------------------------------------------------------------
 
-    def upsert_weather_bulk(self, rows: list[dict]) -> None:
-        if not rows:
-            return
-        update_cols = {
-            col: getattr(sqlite_insert(Weather).excluded, col)
-            for col in (
-                "temperature", "feels_like", "pressure", "humidity",
-                "dew_point", "uvi", "clouds", "visibility",
-                "wind_speed", "wind_degree", "description",
-            )
-        }
+    def upsert_weather_bulk(self, rows: Iterable[dict]) -> int:
         with get_session() as db:
-            stmt = sqlite_insert(Weather).on_conflict_do_update(
+            return _upsert_chunked(
+                db, Weather, rows,
                 index_elements=["latitude", "longitude", "timestamp"],
-                set_=update_cols,
+                update_cols=(
+                    "temperature", "feels_like", "pressure", "humidity",
+                    "dew_point", "uvi", "clouds", "visibility",
+                    "wind_speed", "wind_degree", "description",
+                ),
             )
-            db.execute(stmt, rows)
 
     def get_last_weather_timestamp(
         self,
         lat: float,
         lon: float,
     ) -> datetime | None:
-        with get_session() as db:
+        with get_readonly_session() as db:
             row = db.execute(
                 select(Weather.timestamp)
                 .where(Weather.latitude == lat, Weather.longitude == lon)
@@ -284,24 +448,209 @@ class DatabaseClient:
             ).scalar_one_or_none()
         return row
 
+    def get_last_weather_timestamps(
+        self,
+        locations: Iterable[tuple[float, float]],
+    ) -> dict[tuple[float, float], datetime]:
+        """Last stored weather timestamp for several locations in one query,
+        keyed by (lat, lon).
+
+        Each location's lookup is a correlated subquery, so it is still one
+        backward seek on the primary key (as in
+        :meth:`get_last_weather_timestamp`) rather than a GROUP BY over the
+        whole table.  Locations with no weather rows are absent from the
+        result.
+        """
+        pairs = list(set(locations))
+        if not pairs:
+            return {}
+        locs = values(
+            column("latitude", Float), column("longitude", Float), name="locs"
+        ).data(pairs).cte()
+        last_ts = (
+            select(Weather.timestamp)
+            .where(
+                Weather.latitude == locs.c.latitude,
+                Weather.longitude == locs.c.longitude,
+            )
+            .order_by(Weather.timestamp.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        with get_readonly_session() as db:
+            rows = db.execute(select(locs.c.latitude, locs.c.longitude, last_ts)).all()
+        return {(lat, lon): ts for lat, lon, ts in rows if ts is not None}
+
+    @staticmethod
+    def _weather_series_stmt(
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime,
+    ):
+        # Core rows over the table columns: callers read fields by name, so
+        # skipping ORM instantiation is transparent to them.
+        return (
+            select(*Weather.__table__.columns)
+            .where(
+                Weather.latitude == lat,
+                Weather.longitude == lon,
+                Weather.timestamp >= start,
+                Weather.timestamp < end,
+            )
+            .order_by(Weather.timestamp)
+        )
+
     def get_weather_series(
         self,
         lat: float,
         lon: float,
         start: datetime,
         end: datetime, # end is exclusive
-    ) -> list[Weather]:
-        with get_session() as db:
+    ) -> list[Row]:
+        with get_readonly_session() as db:
+            rows = db.execute(self._weather_series_stmt(lat, lon, start, end)).all()
+        return list(rows)
+
+    def get_weather_series_bulk(
+        self,
+        locations: Iterable[tuple[float, float]],
+        start: datetime,
+        end: datetime, # end is exclusive
+    ) -> dict[tuple[float, float], list[Row]]:
+        """Weather series for several locations in one query, keyed by (lat, lon).
+
+        Locations with no rows in the window are absent from the result.
+        """
+        pairs = list(set(locations))
+        if not pairs:
+            return {}
+        series: dict[tuple[float, float], list[Row]] = {}
+        with get_readonly_session() as db:
             rows = db.execute(
-                select(Weather)
+                select(*Weather.__table__.columns)
                 .where(
-                    Weather.latitude == lat,
-                    Weather.longitude == lon,
+                    tuple_(Weather.latitude, Weather.longitude).in_(pairs),
                     Weather.timestamp >= start,
                     Weather.timestamp < end,
                 )
-                .order_by(Weather.timestamp)
-            ).scalars().all()
+                .order_by(Weather.latitude, Weather.longitude, Weather.timestamp)
+            )
             for row in rows:
-                db.expunge(row)
-        return list(rows)
+                series.setdefault((row.latitude, row.longitude), []).append(row)
+        return series
+
+    @staticmethod
+    def _latest_weather_stmt(lat: float, lon: float, start: datetime, end: datetime):
+        # Backward seek on the (latitude, longitude, timestamp) primary key.
+        return (
+            select(*Weather.__table__.columns)
+            .where(
+                Weather.latitude == lat,
+                Weather.longitude == lon,
+                Weather.timestamp >= start,
+                Weather.timestamp < end,
+            )
+            .order_by(Weather.timestamp.desc())
+            .limit(1)
+        )
+
+    # ------------------------------------------------------------------
+    # Combined reads
+    # ------------------------------------------------------------------
+
+    def get_energy_summary_rows(
+        self,
+        customer_id: int,
+        start: datetime,
+        end: datetime, # end is exclusive
+    ) -> EnergySummaryRows | None:
+        # One session / connection for the customer lookup, both totals and
+        # the latest weather and Pearson rows, instead of one per query.
+        with get_readonly_session() as db:
+            customer = db.get(Customer, customer_id)
+            if customer is None:
+                return None
+            db.expunge(customer)
+
+            # Both totals are aggregated in SQLite — no rows are materialised.
+            production_sum = db.execute(
+                select(func.coalesce(func.sum(Production.power), 0.0)).where(
+                    Production.customer_id == customer_id,
+                    Production.timestamp >= start,
+                    Production.timestamp < end,
+                )
+            ).scalar_one()
+            consumption_sum = db.execute(
+                select(func.coalesce(func.sum(Consumption.power), 0.0)).where(
+                    Consumption.customer_id == customer_id,
+                    Consumption.timestamp >= start,
+                    Consumption.timestamp < end,
+                )
+            ).scalar_one()
+            latest_weather = db.execute(
+                self._latest_weather_stmt(customer.latitude, customer.longitude, start, end)
+            ).first()
+            latest_pearson = db.execute(
+                self._latest_pearson_stmt(customer_id, start, end)
+            ).first()
+
+        return EnergySummaryRows(
+            customer=customer,
+            production_sum=production_sum,
+            consumption_sum=consumption_sum,
+            latest_weather=latest_weather,
+            latest_pearson=latest_pearson,
+        )
+
+    def get_historical_series(
+        self,
+        customer_id: int,
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime, # end is exclusive
+        include_correlation: bool = True,
+    ) -> HistoricalSeries:
+        # The four measured series in one UNION ALL round-trip, tagged by
+        # ``kind`` and split back apart here, instead of one query each.
+        def tagged(kind: str, model, value, *where):
+            return select(
+                literal(kind).label("kind"),
+                model.timestamp.label("timestamp"),
+                value.label("value"),
+            ).where(*where, model.timestamp >= start, model.timestamp < end)
+
+        stmt = union_all(
+            tagged("production", Production, Production.power,
+                   Production.customer_id == customer_id),
+            tagged("consumption", Consumption, Consumption.power,
+                   Consumption.customer_id == customer_id),
+            tagged("weather", Weather, Weather.temperature,
+                   Weather.latitude == lat, Weather.longitude == lon),
+            tagged("irradiance", Irradiance, Irradiance.irradiance,
+                   Irradiance.latitude == lat, Irradiance.longitude == lon),
+        ).order_by("kind", "timestamp")
+
+        # Split straight into (timestamps, values) columns — no per-row
+        # objects survive past this loop.
+        columns: dict[str, tuple[list, list]] = {
+            kind: ([], []) for kind in ("production", "consumption", "weather", "irradiance")
+        }
+        latest_pearson: Optional[Row] = None
+        with get_readonly_session() as db:
+            for kind, ts, value in db.execute(stmt):
+                timestamps, vals = columns[kind]
+                timestamps.append(ts)
+                vals.append(value)
+            # Only the last coefficient pair is ever shown, so seek to it
+            # rather than reading the day's series.
+            if include_correlation:
+                latest_pearson = db.execute(
+                    self._latest_pearson_stmt(customer_id, start, end)
+                ).first()
+
+        return HistoricalSeries(
+            **{kind: TimeSeries.from_columns(*cols) for kind, cols in columns.items()},
+            latest_pearson=latest_pearson,
+        )
@@ -3,26 +3,9 @@
 from __future__ import annotations
 
 import argparse
-import os
-from pathlib import Path
-
-from api.config import settings
-
-# Resolve sqlite:///relative.db paths to INSTANCE_DIR/<name>.db so the file
-# lands in a predictable, .gitignore-able location.
-_INSTANCE_DIR = Path(os.environ.get("INSTANCE_DIR", "/tmp/zendo/instance"))
-_INSTANCE_DIR.mkdir(parents=True, exist_ok=True)
-
-_db_url = settings.DATABASE_URL
-if _db_url.startswith("sqlite:///") and not _db_url.startswith("sqlite:////"):
-    # Relative SQLite URL — rewrite to use instance/ directory.
-    _db_file = _db_url.removeprefix("sqlite:///")
-    if not Path(_db_file).is_absolute():
-        _db_url = f"sqlite:///{_INSTANCE_DIR / _db_file}"
-        os.environ["DATABASE_URL"] = _db_url  # propagate before engine is created
-
-from api.db.models import Base  # noqa: E402 — must follow DATABASE_URL env patch
-from api.db.session import engine  # noqa: E402 — must follow DATABASE_URL env patch
+
+from api.db.models import Base
+from api.db.session import engine
 
 
 def init_db(drop: bool = False) -> None:
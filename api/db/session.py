@@ -1,35 +1,110 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from api.config import settings
 
+
+def resolve_db_url(raw: str) -> str:
+    """Return *raw* with a relative SQLite file path anchored in INSTANCE_DIR.
+
+    ``sqlite:///zendo_dev.db`` becomes ``sqlite:///<INSTANCE_DIR>/zendo_dev.db``
+    so the file lands in a predictable, .gitignore-able location regardless of
+    the working directory.  Absolute paths, in-memory databases and other
+    backends are returned unchanged.
+    """
+    url = make_url(raw)
+    database = url.database
+    if (
+        url.get_backend_name() != "sqlite"
+        or not database
+        or database == ":memory:"
+        or Path(database).is_absolute()
+    ):
+        return raw
+
+    instance_dir = Path(settings.INSTANCE_DIR)
+    instance_dir.mkdir(parents=True, exist_ok=True)
+    return url.set(database=str(instance_dir / database)).render_as_string(hide_password=False)
+
+
+DATABASE_URL = resolve_db_url(settings.DATABASE_URL)
+
 # ``check_same_thread=False`` is required for SQLite when the same connection
 # is used across multiple threads (e.g. FastAPI worker threads).
 _connect_args = (
-    {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+)
+
+# A persistent pool keeps each connection's SQLite page cache warm between
+# requests.  In-memory databases are per-connection, so they keep SQLAlchemy's
+# default single-connection pool.
+_in_memory = make_url(DATABASE_URL).database in (None, "", ":memory:")
+_pool_args = (
+    {}
+    if _in_memory
+    else {"poolclass": QueuePool, "pool_size": 8, "max_overflow": 16, "pool_recycle": 3600}
 )
 
 engine = create_engine(
-    settings.DATABASE_URL,
+    DATABASE_URL,
     connect_args=_connect_args,
     echo=settings.DEBUG,
+    **_pool_args,
 )
 
+# WAL lets the API's series reads proceed while the ETL jobs are committing
+# upserts; NORMAL sync is durable under WAL except across power loss, and the
+# mmap window / 64 MiB page cache keep the time-series pages hot.  Sort and
+# temp B-trees stay in memory rather than spilling to temp files.  WAL still
+# allows only one writer, so concurrent ETL upserts wait out the busy timeout
+# instead of failing immediately with "database is locked".
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS:d}",
+)
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 SessionLocal: sessionmaker[Session] = sessionmaker(
     bind=engine,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
 )
 
+# One Session object per thread, reused across calls.  ``close()`` only
+# releases its connection back to the pool, so the next ``get_session`` on the
+# same thread skips constructing a new Session and its identity map.
+#
+# Because the Session is per thread, ``get_session`` / ``get_readonly_session``
+# blocks must not be nested on one thread: the inner block gets the *same*
+# Session as the outer one, its commit/rollback applies to the outer work too,
+# and its ``close()`` ends the outer block's transaction.  Pass the open
+# session down instead of opening another block.
+ScopedSession = scoped_session(SessionLocal)
+
 
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
-    session = SessionLocal()
+    session = ScopedSession()
     try:
         yield session
         session.commit()
@@ -38,3 +113,17 @@ def get_session() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def get_readonly_session() -> Generator[Session, None, None]:
+    """Like :func:`get_session` but never commits.
+
+    For pure reads there is nothing to flush, so the commit round-trip is
+    skipped; ``close()`` rolls the read transaction back.
+    """
+    session = ScopedSession()
+    try:
+        yield session
+    finally:
+        session.close()
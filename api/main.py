@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
 from contextlib import asynccontextmanager
 from datetime import date, timedelta
 
-from apscheduler.executors.pool import ThreadPoolExecutor
-from apscheduler.schedulers.background import BackgroundScheduler
+from anyio import to_thread
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from api.router import router
 from api.config import settings
-from etl.orchestration import run_etl_chain
+from api.router import aclose_clients, router
+from etl.orchestration import run_correlation_step, run_etl_chain, run_source_steps
 
 log = logging.getLogger(__name__)
 
@@ -39,27 +41,46 @@ def _run_backfill() -> None:
         "Starting backfill from %s to %s (%d day(s)).", start, today, total_days
     )
 
-    current = start
-    while current <= today:
-        log.info("Backfilling %s ...", current)
-        run_etl_chain(current)
-        current += timedelta(days=1)
+    days = [start + timedelta(days=i) for i in range(total_days)]
+
+    def _backfill_day(day: date) -> bool:
+        log.info("Backfilling %s ...", day)
+        return run_source_steps(day)
+
+    # Days are independent up to the Pearson step, whose trailing window
+    # reads the previous day — so fetch/simulate every day concurrently
+    # first, then correlate the days whose sources completed.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, settings.BACKFILL_CONCURRENCY)) as pool:
+        succeeded = list(pool.map(_backfill_day, days))
+        list(pool.map(run_correlation_step, [d for d, ok in zip(days, succeeded) if ok]))
 
     log.info("Backfill complete.")
 
 
-def _scheduled_job() -> None:
-    """ETL job that runs every 15 minutes — processes today's date."""
-    run_etl_chain(date.today())
+async def _scheduled_job() -> None:
+    """ETL job that runs every 15 minutes — processes today's date.
+
+    Scheduling lives on the app's event loop; the blocking ETL itself is
+    handed to a worker thread so requests keep being served meanwhile.
+    """
+    await asyncio.to_thread(run_etl_chain, date.today())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Sync handlers and the ETL hand-offs share this pool; size it explicitly
+    # so a long backfill can't starve request handling.  The limiter belongs
+    # to the running event loop, hence set here rather than in create_app.
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+
     # Backfill runs in a thread so it doesn't block the event loop
     await asyncio.to_thread(_run_backfill)
 
-    scheduler = BackgroundScheduler(executors={"default": ThreadPoolExecutor(1)})
-    scheduler.add_job(_scheduled_job, "interval", minutes=15, id="etl_15min")
+    scheduler = AsyncIOScheduler()
+    # max_instances=1: a slow run is never overlapped by the next tick.
+    scheduler.add_job(
+        _scheduled_job, "interval", minutes=15, id="etl_15min", max_instances=1, coalesce=True
+    )
     scheduler.start()
     log.info("APScheduler started — ETL job runs every 15 minutes.")
 
@@ -67,10 +88,11 @@ async def lifespan(app: FastAPI):
 
     scheduler.shutdown(wait=False)
     log.info("APScheduler stopped.")
+    await aclose_clients()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["http://localhost:5173", "http://localhost:3000"],
@@ -1,8 +1,16 @@
+import io
+from operator import attrgetter
 from datetime import date, datetime
-from typing import Dict, Optional
+from typing import Dict, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from api.clients.openweather import OpenWeatherClient, OpenWeatherError
 from api.config import settings
@@ -12,12 +20,33 @@ from api.services.energy_summary import (
 )
 from api.services.timeseries import CustomerNotFoundError, TimeSeriesService
 from api.db.client import DatabaseClient
+from lib.ttl_cache import TTLCache
+from lib.types import HistoricalData, TimeSeries
 
 router = APIRouter()
 
+# One client for every route and service; it holds no connection itself and
+# checks sessions out of the engine's shared QueuePool per call.
 _db = DatabaseClient()
-_timeseries_service = TimeSeriesService()
-_energy_summary_service = EnergySummaryService()
+
+# One pooled OpenWeather client for the process, so repeat requests reuse its
+# kept-alive HTTP/2 connection instead of paying a TLS handshake each time.
+_ow = OpenWeatherClient(api_key=settings.OPENWEATHER_API_KEY)
+
+# Current conditions only refresh every few minutes upstream; nearby customers
+# (same coordinates to ~1 km) share an entry.
+_CURRENT_WEATHER_TTL_S = 300.0
+_current_weather_cache: TTLCache[tuple[float, float], "WeatherResponse"] = TTLCache(
+    ttl=_CURRENT_WEATHER_TTL_S
+)
+_timeseries_service = TimeSeriesService(_db)
+_energy_summary_service = EnergySummaryService(_db)
+
+
+async def aclose_clients() -> None:
+    """Release the shared OpenWeather client's pools; called on app shutdown."""
+    await _ow.aclose()
+    _ow.close()
 
 
 # ---------------------------------------------------------------------------
@@ -26,12 +55,19 @@ _energy_summary_service = EnergySummaryService()
 
 
 class CustomerResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     customer_id: int
     name: str
     latitude: float
     longitude: float
 
 
+# Built once at import: the list shape never changes, so the handler reuses one
+# compiled validator/serializer instead of FastAPI rebuilding it per response.
+_CUSTOMER_LIST = TypeAdapter(list[CustomerResponse])
+
+
 class WeatherResponse(BaseModel):
     temperature: float
     feels_like: float
@@ -77,93 +113,196 @@ class EnergySummaryResponse(BaseModel):
     correlation: Optional[CorrelationResponse]
 
 
+# The service already returns typed dataclasses, so the energy summary is
+# copied field-by-field with getters fixed at import instead of re-validated.
+_SUMMARY_FIELDS = ("customer_id", "date", "total_production_kwh", "total_consumption_kwh", "net_kwh")
+_WEATHER_SUMMARY_FIELDS = tuple(WeatherSummaryResponse.model_fields)
+_CORRELATION_FIELDS = tuple(CorrelationResponse.model_fields)
+_get_summary = attrgetter(*_SUMMARY_FIELDS)
+_get_weather_summary = attrgetter(*_WEATHER_SUMMARY_FIELDS)
+_get_correlation = attrgetter(*_CORRELATION_FIELDS)
+
+
+def _energy_summary_dict(summary) -> dict:
+    payload = dict(zip(_SUMMARY_FIELDS, _get_summary(summary)))
+    ws = summary.weather_summary
+    payload["weather_summary"] = (
+        None if ws is None else dict(zip(_WEATHER_SUMMARY_FIELDS, _get_weather_summary(ws)))
+    )
+    corr = summary.correlation
+    payload["correlation"] = (
+        None if corr is None else dict(zip(_CORRELATION_FIELDS, _get_correlation(corr)))
+    )
+    return payload
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
 
 
-@router.get("/customers", response_model=list[CustomerResponse])
+@router.get(
+    "/customers",
+    response_model=list[CustomerResponse],
+    response_class=ORJSONResponse,
+)
 def list_customers():
     """Return all customers."""
-    customers = _db.list_customers()
-    return [
-        CustomerResponse(
-            customer_id=c.customer_id,
-            name=c.name,
-            latitude=c.latitude,
-            longitude=c.longitude,
-        )
-        for c in customers
-    ]
+    customers = _CUSTOMER_LIST.validate_python(_db.list_customers(), from_attributes=True)
+    return ORJSONResponse(_CUSTOMER_LIST.dump_python(customers))
 
 
 @router.get("/customers/{customer_id}/weather", response_model=WeatherResponse)
-def customer_weather(customer_id: int):
-    """Return current weather at the customer's location via OpenWeather."""
-    customer = _db.get_customer(customer_id)
+async def customer_weather(customer_id: int):
+    """Return current weather at the customer's location via OpenWeather.
+
+    Async so the upstream HTTP call waits on the event loop rather than
+    holding a threadpool slot; only the short DB lookup borrows a thread.
+    """
+    customer = await run_in_threadpool(_db.get_customer, customer_id)
     if customer is None:
         raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
 
-    ow = OpenWeatherClient(api_key=settings.OPENWEATHER_API_KEY)
+    cache_key = (round(customer.latitude, 2), round(customer.longitude, 2))
+    cached = _current_weather_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        data = ow.get_current_weather(lat=customer.latitude, lon=customer.longitude)
+        data = await _ow.aget_current_weather(lat=customer.latitude, lon=customer.longitude)
     except OpenWeatherError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
-    finally:
-        ow.close()
 
-    return WeatherResponse(
+    weather = WeatherResponse(
         temperature=data["main"]["temp"],
         feels_like=data["main"]["feels_like"],
         description=data["weather"][0]["description"],
         icon=data["weather"][0]["icon"],
     )
+    _current_weather_cache.set(cache_key, weather)
+    return weather
 
 
-@router.get("/customer/{customer_id}/energy-summary/{target_date}", response_model=EnergySummaryResponse)
+@router.get(
+    "/customer/{customer_id}/energy-summary/{target_date}",
+    response_model=EnergySummaryResponse,
+    response_class=ORJSONResponse,
+)
 def energy_summary(customer_id: int, target_date: date):
-    """Return daily energy totals, weather summary, and latest Pearson correlations."""
+    """Return daily energy totals, weather summary, and latest Pearson correlations.
+
+    The payload is encoded with orjson and returned directly, skipping
+    FastAPI's ``jsonable_encoder`` + stdlib ``json`` serialisation pass.
+    """
     try:
         summary = _energy_summary_service.get_energy_summary(customer_id, target_date)
     except EnergySummaryNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return EnergySummaryResponse(
-        customer_id=summary.customer_id,
-        date=summary.date,
-        total_production_kwh=summary.total_production_kwh,
-        total_consumption_kwh=summary.total_consumption_kwh,
-        net_kwh=summary.net_kwh,
-        weather_summary=WeatherSummaryResponse(**vars(summary.weather_summary))
-        if summary.weather_summary else None,
-        correlation=CorrelationResponse(**vars(summary.correlation))
-        if summary.correlation else None,
+    return ORJSONResponse(_energy_summary_dict(summary))
+
+
+def _point_dicts(series: TimeSeries) -> list[dict]:
+    # Columnar internally; the wire format stays a list of {timestamp, value}.
+    return [
+        {"timestamp": t, "value": v}
+        for t, v in zip(series.timestamps.tolist(), series.values.tolist())
+    ]
+
+
+_PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+_ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+_HISTORICAL_SERIES = ("production", "consumption", "temperature", "irradiance")
+
+
+def _historical_table(data: HistoricalData) -> pa.Table:
+    """Lay the historical series out as one long-format Arrow table.
+
+    Columns are ``series`` (dictionary-encoded name), ``timestamp`` and
+    ``value``; the customer and date travel in the schema metadata.
+    """
+    series = [getattr(data, name) for name in _HISTORICAL_SERIES]
+    names = pa.DictionaryArray.from_arrays(
+        pa.array(np.repeat(np.arange(len(series), dtype=np.int8), [len(s) for s in series])),
+        pa.array(_HISTORICAL_SERIES),
     )
+    return pa.table(
+        {
+            "series": names,
+            "timestamp": pa.array(np.concatenate([s.timestamps for s in series])),
+            "value": pa.array(np.concatenate([s.values for s in series])),
+        }
+    ).replace_schema_metadata(
+        {"customer_id": str(data.customer_id), "date": data.date.isoformat()}
+    )
+
 
+def _historical_parquet(data: HistoricalData) -> bytes:
+    buf = io.BytesIO()
+    pq.write_table(_historical_table(data), buf, compression="zstd")
+    return buf.getvalue()
 
-@router.get("/customer/{customer_id}/historical-data/{date}", response_model=HistoricalDataResponse)
+
+def _historical_arrow_stream(data: HistoricalData) -> bytes:
+    table = _historical_table(data)
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@router.get(
+    "/customer/{customer_id}/historical-data/{date}",
+    response_model=HistoricalDataResponse,
+    response_class=ORJSONResponse,
+    responses={200: {"content": {_PARQUET_MEDIA_TYPE: {}, _ARROW_STREAM_MEDIA_TYPE: {}}}},
+)
 def historical_data(
+    request: Request,
     customer_id: int,
     date: date,
+    fmt: Literal["json", "parquet", "arrow"] = Query("json", alias="format"),
+    include_correlation: bool = True,
 ):
     """Return full-day time series for production, consumption, and temperature
     for a given customer and date.
 
     All series contain 15-minute interval readings covering the requested
-    calendar day (midnight-to-midnight, inclusive).  ``correlation`` is
-    reserved for a future implementation and is always ``null``.
+    calendar day (midnight-to-midnight, inclusive).  ``correlation`` holds the
+    day's latest Pearson coefficients (``null`` if none are stored yet);
+    ``?include_correlation=false`` skips that lookup and always returns ``null``.
+
+    ``?format=parquet`` returns the same series as a zstd-compressed Parquet
+    file (long format: ``series``, ``timestamp``, ``value``) for bulk and
+    analytics consumers.  ``?format=arrow``, or an ``Accept`` header naming
+    ``application/vnd.apache.arrow.stream``, returns that table as an Arrow
+    IPC stream that clients can read column-wise without parsing.
     """
     try:
-        data = _timeseries_service.get_historical_data(customer_id, date)
+        data = _timeseries_service.get_historical_data(
+            customer_id, date, include_correlation=include_correlation
+        )
     except CustomerNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return HistoricalDataResponse(
-        customer_id=data.customer_id,
-        date=data.date,
-        production=[TimeSeriesPoint(timestamp=p.timestamp, value=p.value) for p in data.production],
-        consumption=[TimeSeriesPoint(timestamp=p.timestamp, value=p.value) for p in data.consumption],
-        temperature=[TimeSeriesPoint(timestamp=p.timestamp, value=p.value) for p in data.temperature],
-        irradiance=[TimeSeriesPoint(timestamp=p.timestamp, value=p.value) for p in data.irradiance],
-        correlation=data.correlation,
+    if fmt == "parquet":
+        return Response(content=_historical_parquet(data), media_type=_PARQUET_MEDIA_TYPE)
+    # Read off the request rather than declared as a Header parameter, so
+    # ``format`` stays the only documented format switch.
+    accept = request.headers.get("accept")
+    if fmt == "arrow" or (accept is not None and _ARROW_STREAM_MEDIA_TYPE in accept):
+        return Response(content=_historical_arrow_stream(data), media_type=_ARROW_STREAM_MEDIA_TYPE)
+
+    # Plain dicts straight to orjson: no per-point pydantic objects and no
+    # jsonable_encoder pass.  ``response_model`` still documents the schema.
+    return ORJSONResponse(
+        {
+            "customer_id": data.customer_id,
+            "date": data.date,
+            "production": _point_dicts(data.production),
+            "consumption": _point_dicts(data.consumption),
+            "temperature": _point_dicts(data.temperature),
+            "irradiance": _point_dicts(data.irradiance),
+            "correlation": data.correlation,
+        }
     )
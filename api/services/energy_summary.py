@@ -7,6 +7,9 @@ from typing import Optional
 from api.db.client import DatabaseClient
 from lib.time_util import day_window, interval_hours
 
+# Readings are stored at 15-minute resolution; hours per reading for kW → kWh.
+_INTERVAL_15M_H = interval_hours("15m")
+
 
 class CustomerNotFoundError(Exception):
     def __init__(self, customer_id: int) -> None:
@@ -45,49 +48,39 @@ class EnergySummaryService:
         self._db = db or DatabaseClient()
 
     def get_energy_summary(self, customer_id: int, target_date: date) -> EnergySummary:
-        customer = self._db.get_customer(customer_id)
-        if customer is None:
-            raise CustomerNotFoundError(customer_id)
-
         start_time, end_time = day_window(target_date, limit_to_now=True)
 
+        rows = self._db.get_energy_summary_rows(customer_id, start_time, end_time)
+        if rows is None:
+            raise CustomerNotFoundError(customer_id)
+
         # ------------------------------------------------------------------
         # Totals — sum kW readings over 15-min intervals → kWh (* 0.25 h)
         # ------------------------------------------------------------------
-        production_rows = self._db.get_production_series(customer_id, start_time, end_time)
-        consumption_rows = self._db.get_consumption_series(customer_id, start_time, end_time)
-
-        total_production_kwh = round(sum(r.power for r in production_rows) * interval_hours("15m"), 3)
-        total_consumption_kwh = round(sum(r.power for r in consumption_rows) * interval_hours("15m"), 3)
+        total_production_kwh = round(rows.production_sum * _INTERVAL_15M_H, 3)
+        total_consumption_kwh = round(rows.consumption_sum * _INTERVAL_15M_H, 3)
         net_kwh = round(total_production_kwh - total_consumption_kwh, 3)
 
         # ------------------------------------------------------------------
-        # Weather summary from the stored weather time series
+        # Weather summary from the latest stored weather reading
         # ------------------------------------------------------------------
         weather_summary: WeatherSummary | None = None
-        weather_rows = self._db.get_weather_series(
-            lat=customer.latitude,
-            lon=customer.longitude,
-            start=start_time,
-            end=end_time,
-        )
-        if weather_rows:
-            temps = [r.temperature for r in weather_rows]
+        latest_weather = rows.latest_weather
+        if latest_weather is not None:
             weather_summary = WeatherSummary(
-                temperature=temps[-1],
-                feels_like=weather_rows[-1].feels_like,
-                description=weather_rows[-1].description,
-                cloud_cover=weather_rows[-1].clouds,
-                wind_speed=weather_rows[-1].wind_speed,
+                temperature=latest_weather.temperature,
+                feels_like=latest_weather.feels_like,
+                description=latest_weather.description,
+                cloud_cover=float(latest_weather.clouds),  # stored as an integer %
+                wind_speed=latest_weather.wind_speed,
             )
 
         # ------------------------------------------------------------------
         # Correlation — latest Pearson row for the target date
         # ------------------------------------------------------------------
         correlation: Optional[Correlation] = None
-        pearson_rows = self._db.get_pearson_series(customer_id, start_time, end_time)
-        if pearson_rows:
-            latest = pearson_rows[-1]
+        latest = rows.latest_pearson
+        if latest is not None:
             correlation = Correlation(
                 solar_irradiance_vs_production=latest.solar_irradiance_vs_production,
                 temperature_vs_consumption=latest.temperature_vs_consumption,
@@ -3,10 +3,16 @@ from __future__ import annotations
 from datetime import date, datetime, time, timedelta
 from lib.series_util import interpolate_time_series
 from lib.time_util import day_window
-from lib.types import TimeSeriesPoint, HistoricalData
+from lib.ttl_cache import TTLCache
+from lib.types import HistoricalData
 
 
 from api.db.client import DatabaseClient
+from api.db.models import Customer
+
+# Customers are effectively static (created by the seed ETL, never edited
+# through the API), so a short TTL only bounds how long a change takes to show.
+_CUSTOMER_TTL_S = 60.0
 
 
 class CustomerNotFoundError(Exception):
@@ -20,49 +26,46 @@ class TimeSeriesService:
 
     def __init__(self, db: DatabaseClient | None = None) -> None:
         self._db = db or DatabaseClient()
+        self._customers: TTLCache[int, Customer] = TTLCache(ttl=_CUSTOMER_TTL_S)
 
-    def get_historical_data(self, customer_id: int, day: date, fill_gaps: bool = False) -> HistoricalData:
-        customer = self._db.get_customer(customer_id)
+    def _get_customer(self, customer_id: int) -> Customer | None:
+        customer = self._customers.get(customer_id)
+        if customer is None:
+            # Misses aren't cached, so a newly added customer shows up at once.
+            customer = self._db.get_customer(customer_id)
+            if customer is not None:
+                self._customers.set(customer_id, customer)
+        return customer
+
+    def get_historical_data(
+        self,
+        customer_id: int,
+        day: date,
+        fill_gaps: bool = False,
+        include_correlation: bool = True,
+    ) -> HistoricalData:
+        customer = self._get_customer(customer_id)
         if customer is None:
             raise CustomerNotFoundError(customer_id)
 
         start_time, end_time = day_window(day, limit_to_now=True)
 
-        production_rows = self._db.get_production_series(customer_id, start_time, end_time)
-        consumption_rows = self._db.get_consumption_series(customer_id, start_time, end_time)
-        weather_rows = self._db.get_weather_series(
-            customer.latitude, customer.longitude, start_time, end_time
+        series = self._db.get_historical_series(
+            customer_id, customer.latitude, customer.longitude, start_time, end_time,
+            include_correlation=include_correlation,
         )
-        irradiance_rows = self._db.get_irradiance_series(
-            customer.latitude, customer.longitude, start_time, end_time
-        )
-        correlation_rows = self._db.get_pearson_series(customer_id, start_time, end_time)
-
-        production = [
-                TimeSeriesPoint(timestamp=r.timestamp, value=r.power)
-                for r in production_rows
-            ]
-
-        consumption = [
-                TimeSeriesPoint(timestamp=r.timestamp, value=r.power)
-                for r in consumption_rows
-            ]
-
-        temperature = [
-                TimeSeriesPoint(timestamp=r.timestamp, value=r.temperature)
-                for r in weather_rows
-            ]
-        
-        irradiance = [
-                TimeSeriesPoint(timestamp=r.timestamp, value=r.irradiance)
-                for r in irradiance_rows
-            ]
+        latest = series.latest_pearson
+
+        production = series.production
+        consumption = series.consumption
+        temperature = series.weather
+        irradiance = series.irradiance
 
         if fill_gaps:
             production = interpolate_time_series(production)
             consumption = interpolate_time_series(consumption)
             temperature = interpolate_time_series(temperature)
-            irradiance = interpolate_time_series(irradiance)        
+            irradiance = interpolate_time_series(irradiance)
 
         return HistoricalData(
             customer_id=customer_id,
@@ -72,7 +75,7 @@ class TimeSeriesService:
             temperature=temperature,
             irradiance=irradiance,
             correlation={
-                "solar_irradiance_vs_production_correlation": correlation_rows[-1].solar_irradiance_vs_production,
-                "temperature_vs_consumption_correlation": correlation_rows[-1].temperature_vs_consumption
-            } if correlation_rows else None,
+                "solar_irradiance_vs_production_correlation": latest.solar_irradiance_vs_production,
+                "temperature_vs_consumption_correlation": latest.temperature_vs_consumption
+            } if latest is not None else None,
         )
@@ -1,8 +1,44 @@
 from __future__ import annotations
 
+import math
 from typing import Sequence
 
-from lib.predictable_jitter import predictable_jitter
+import numpy as np
+
+from lib.predictable_jitter import predictable_jitter_vec
+
+# Largest decay spread allowed inside one closed-form EMA block; bounds the
+# growth of 1/decay**i so the cumulative sum keeps full float64 precision.
+_EMA_MIN_DECAY = 1e-3
+
+
+def _ema(x: np.ndarray, k: float, y0: float) -> np.ndarray:
+    """First-order lag ``y[n] = y[n-1] + k * (x[n] - y[n-1])`` seeded at *y0*.
+
+    Unrolled per block as ``y[j] = d**(j+1) * (y0 + k * cumsum(x / d**(i+1)))``
+    with ``d = 1 - k``, so the recursion runs as array ops; only the block
+    boundaries (one per ~ln(1e-3)/ln(d) samples) are stepped in Python.
+    Each block is computed in place in the output buffer.
+    """
+    d = 1.0 - k
+    if d <= 0.0:
+        return x.copy()
+    block = max(1, int(math.log(_EMA_MIN_DECAY) / math.log(d)))
+    powers = d ** np.arange(1, min(block, len(x)) + 1)
+
+    out = np.empty_like(x)
+    y = y0
+    for start in range(0, len(x), block):
+        chunk = x[start:start + block]
+        p = powers[:len(chunk)]
+        seg = out[start:start + len(chunk)]
+        np.divide(chunk, p, out=seg)
+        np.cumsum(seg, out=seg)
+        seg *= k
+        seg += y
+        seg *= p
+        y = seg[-1]
+    return out
 
 
 class DatacenterSimulator:
@@ -57,12 +93,23 @@ class DatacenterSimulator:
         """
         Given a time series of ambient temperatures, return the corresponding datacenter power demand at each time step.
         """
-        if not temperatures:
-            return []
+        return self.simulate_array(temperatures, t_initial).tolist()
 
-        t0 = t_initial if t_initial is not None else temperatures[0]
-        t_short = t0
-        t_long = t0
+    def simulate_array(
+        self,
+        temperatures: Sequence[float],
+        t_initial: float | None = None,
+    ) -> np.ndarray:
+        """Same as :meth:`simulate`, but returns the loads as a float64 array.
+
+        The result always has the same shape as *temperatures*.
+        """
+        temps = np.asarray(temperatures, dtype=np.float64)
+        if temps.ndim != 1:
+            raise ValueError(f"temperatures must be one-dimensional, got shape {temps.shape}")
+        if len(temps) == 0:
+            return temps
+        t0 = t_initial if t_initial is not None else temps[0]
 
         dt = self.interval_hours
         k_short = dt / self.tau_cooling_hours
@@ -72,25 +119,26 @@ class DatacenterSimulator:
         k_short = min(k_short, 1.0)
         k_long = min(k_long, 1.0)
 
-        loads: list[float] = []
-
-        for t_amb in temperatures:
-            # Update both lag states
-            t_short += k_short * (t_amb - t_short)
-            t_long += k_long * (t_amb - t_long)
-
-            # Blend into a single effective temperature
-            t_eff = self.alpha * t_short + (1.0 - self.alpha) * t_long
-
-            # PUE rises only above the free-cooling setpoint
-            pue = self.pue_base + self.pue_temp_coeff * max(0.0, t_eff - self.temp_setpoint)
-
-            # Total facility power = IT load × utilisation × PUE
-            load = self.it_load_kw * self.utilisation * pue
-
-            jittered_load = load + predictable_jitter(t_amb, self.jitter, 2)
-
-            loads.append(jittered_load)
+        # Both lag states, blended in place into a single effective
+        # temperature; every step below reuses these two buffers.
+        t_eff = _ema(temps, k_short, t0)
+        t_long = _ema(temps, k_long, t0)
+        t_eff *= self.alpha
+        t_long *= 1.0 - self.alpha
+        t_eff += t_long
+
+        # PUE rises only above the free-cooling setpoint
+        pue = t_eff
+        pue -= self.temp_setpoint
+        np.maximum(pue, 0.0, out=pue)
+        pue *= self.pue_temp_coeff
+        pue += self.pue_base
+
+        # Total facility power = IT load × utilisation × PUE
+        loads = pue
+        loads *= self.it_load_kw * self.utilisation
+
+        loads += predictable_jitter_vec(temps, self.jitter, 2)
 
         return loads
 
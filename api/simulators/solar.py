@@ -50,7 +50,9 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from lib.predictable_jitter import predictable_jitter
+import numpy as np
+
+from lib.predictable_jitter import predictable_jitter_vec
 
 _G_STC = 1000.0  # W/m² — Standard Test Condition irradiance reference
 _NOCT_DELTA_T = 25.0  # °C — typical cell temperature rise above ambient at 1000 W/m²
@@ -103,31 +105,40 @@ class SolarSimulator:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _cell_temperature(self, ambient_temp: float, ghi: float) -> float:
-        """Estimate cell temperature using the NOCT approximation.
+    def _simulate_core(
+        self,
+        ghi: np.ndarray,
+        temperatures: np.ndarray | None,
+    ) -> np.ndarray:
+        """Vectorised AC output (kW) for already-clamped GHI, before jitter.
 
-        Args:
-            t_amb: Ambient temperature (°C).
-            ghi:   Global horizontal irradiance (W/m²).
+        Evaluates, element-wise::
 
-        Returns:
-            Estimated cell temperature (°C).
-        """
-        return ambient_temp + _NOCT_DELTA_T * (ghi / _G_STC)
+            T_cell = T_amb + ΔT_NOCT · (G / G_STC)
+            f_temp = 1 + γ · (T_cell − 25)
+            P_ac   = P_stc · (G / G_STC) · f_temp · PR
 
-    def _temp_derating(self, t_cell: float) -> float:
-        """Return the temperature derating factor for a given cell temperature.
+        The scalar factors are folded up front and the array work runs in
+        place on a single output buffer, so a call allocates one array no
+        matter how long the series is.  Without temperatures the cells sit
+        at 25 °C, f_temp is exactly 1, and the whole model is one multiply.
+        """
+        scale = self.installed_capacity_kw * self.performance_ratio / _G_STC
 
-        The factor equals 1.0 at STC (25 °C) and decreases linearly above it.
-        Values below 25 °C produce a slight gain, which is physically correct.
+        if temperatures is None:
+            return ghi * scale
 
-        Args:
-            t_cell: Cell temperature (°C).
+        # f_temp, built in place: 1 + γ · (T_amb + ΔT·G/G_STC − 25)
+        out = ghi * (_NOCT_DELTA_T / _G_STC)
+        out += temperatures
+        out -= 25.0
+        out *= self.temp_coefficient
+        out += 1.0
 
-        Returns:
-            Derating factor (dimensionless).
-        """
-        return 1.0 + self.temp_coefficient * (t_cell - 25.0)
+        # P_ac
+        out *= ghi
+        out *= scale
+        return out
 
     # ------------------------------------------------------------------
     # Public API
@@ -147,8 +158,8 @@ class SolarSimulator:
         at 25 °C (STC), so temperature derating is effectively disabled.
 
         Args:
-            irradiance:   Sequence of GHI values (W/m²).  Negative values
-                          are clamped to zero.
+            irradiance:   Sequence or array of GHI values (W/m²).  Negative
+                          values are clamped to zero.
             temperatures: Optional concurrent ambient temperatures (°C).
                           Must have the same length as ``irradiance`` when
                           provided.
@@ -160,35 +171,34 @@ class SolarSimulator:
             ValueError: If ``temperatures`` is provided but has a different
                         length from ``irradiance``.
         """
-        if temperatures is not None and len(temperatures) != len(irradiance):
+        return self.simulate_array(irradiance, temperatures).tolist()
+
+    def simulate_array(
+        self,
+        irradiance: Sequence[float],
+        temperatures: Sequence[float] | None = None,
+    ) -> np.ndarray:
+        """Same as :meth:`simulate`, but returns the outputs as a float64 array."""
+        ghi = np.asarray(irradiance, dtype=np.float64)
+        temps = None if temperatures is None else np.asarray(temperatures, dtype=np.float64)
+        # Checked on the converted arrays, so ndarray inputs pass through as-is.
+        if temps is not None and temps.shape != ghi.shape:
             raise ValueError(
-                f"temperatures length ({len(temperatures)}) must match "
-                f"irradiance length ({len(irradiance)})"
+                f"temperatures length ({len(temps)}) must match "
+                f"irradiance length ({len(ghi)})"
             )
 
-        output: list[float] = []
-
-        for i, ghi in enumerate(irradiance):
-            ghi = max(ghi, 0.0)  # clamp — sensors occasionally return small negatives at night
-
-            # DC power normalised by STC irradiance
-            p_dc = self.installed_capacity_kw * (ghi / _G_STC)
-
-            # Temperature derating
-            if temperatures is not None:
-                t_cell = self._cell_temperature(temperatures[i], ghi)
-            else:
-                t_cell = 25.0
-            f_temp = self._temp_derating(t_cell)
-
-            # AC output after system losses
-            p_ac = p_dc * f_temp * self.performance_ratio
+        # clamp — sensors occasionally return small negatives at night
+        ghi = np.maximum(ghi, 0.0)
 
-            jittered_production = max(p_ac + predictable_jitter(ghi, self.jitter, 2), 0.0)  # clamp — derating (or jitter) can't make output negative
+        p_ac = self._simulate_core(ghi, temps)
 
-            output.append(jittered_production)
+        jitter = predictable_jitter_vec(ghi, self.jitter, 2)
 
-        return output
+        # clamp — derating (or jitter) can't make output negative.  p_ac is a
+        # fresh buffer from _simulate_core, so both steps run in place.
+        p_ac += jitter
+        return np.maximum(p_ac, 0.0, out=p_ac)
 
     # ------------------------------------------------------------------
     # Convenience
@@ -218,8 +228,8 @@ class SolarSimulator:
         Raises:
             ValueError: If ``irradiance`` is empty.
         """
-        if not irradiance:
+        if len(irradiance) == 0:
             raise ValueError("irradiance must not be empty")
 
-        series = self.simulate(irradiance, temperatures)
-        return sum(series) / (self.installed_capacity_kw * len(series))
+        series = self.simulate_array(irradiance, temperatures)
+        return float(series.mean()) / self.installed_capacity_kw
@@ -1,8 +1,26 @@
+import os
+
 import uvicorn
 
-from api.main import create_app
+from api.config import settings
 
-app = create_app()
+# Re-export the single application instance built in api.main rather than
+# constructing a second one, so both entry points share the same module state
+# (clients, caches, scheduler).
+from api.main import app
 
 if __name__ == "__main__":
-    uvicorn.run("api.wsgi:app", host="0.0.0.0", port=8000, reload=True)
+    if settings.DEBUG:
+        uvicorn.run("api.wsgi:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # No reloader supervisor in production.  Each worker runs its own ETL
+        # scheduler, so scale out via WEB_CONCURRENCY deliberately.
+        uvicorn.run(
+            "api.wsgi:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            log_level="warning",
+        )
@@ -0,0 +1,55 @@
+"""Helpers shared by the per-day ETL jobs."""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import itertools
+from typing import Any, Callable, Iterable, Sequence
+
+# Customers processed concurrently by the per-customer jobs.
+DEFAULT_WORKERS = 8
+
+
+def map_customers(
+    process: Callable[[Any], Iterable[dict]],
+    customers: Sequence[Any],
+    workers: int = DEFAULT_WORKERS,
+) -> list[Iterable[dict]]:
+    """Apply *process* to every customer on up to *workers* threads.
+
+    Customers are independent once their inputs have been fetched, so they are
+    processed side by side; the NumPy work inside *process* releases the GIL.
+    Results come back in customer order.
+    """
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(len(customers), workers))
+    ) as pool:
+        return list(pool.map(process, customers))
+
+
+def upsert_streamed(
+    upsert: Callable[[Iterable[dict]], int],
+    batches: Iterable[Iterable[dict]],
+) -> int:
+    """Upsert every batch of rows (one per customer or location) with *upsert*.
+
+    All batches go through a single ``upsert_*_bulk`` call, so the run commits
+    one transaction rather than one per batch.  The batches are chained
+    lazily, so rows are streamed into the upsert chunk by chunk instead of
+    being flattened into one list first.
+
+    Returns:
+        The number of rows upserted.
+    """
+    return upsert(itertools.chain.from_iterable(batches))
+
+
+def add_workers_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--workers`` flag feeding :func:`map_customers` to a job's CLI."""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Customers processed concurrently (default: {DEFAULT_WORKERS})",
+    )
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import functools
 import logging
 import sys
 from datetime import date, datetime, time, timedelta
-from typing import Any
+from typing import Any, Iterable
+
+import numpy as np
 
 from api.simulators.datacenter import DatacenterSimulator
 from api.db.client import DatabaseClient
+from etl.common import DEFAULT_WORKERS, add_workers_argument, map_customers, upsert_streamed
 from lib.time_util import day_window, interval_hours
 from lib.types import TimeInterval
 
@@ -27,11 +31,16 @@ log = logging.getLogger("etl.consumption")
 # ---------------------------------------------------------------------------
 
 
-def run(target_date: date | None = None, time_interval: TimeInterval = "15m") -> None:
+def run(
+    target_date: date | None = None,
+    time_interval: TimeInterval = "15m",
+    workers: int = DEFAULT_WORKERS,
+    db: DatabaseClient | None = None,
+) -> None:
     target_date = target_date or date.today()
     log.info("Running consumption ETL for %s", target_date.isoformat())
 
-    db = DatabaseClient()
+    db = db or DatabaseClient()
     customers = db.list_customers()
 
     if not customers:
@@ -43,75 +52,26 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
 
     log.info("Processing %d customer(s).", len(customers))
 
-    total_upserted = 0
-
-    for customer in customers:
-        log.info(
-            "  Customer %d (%s)  loc=(%.4f, %.4f)",
-            customer.customer_id,
-            customer.name,
-            customer.latitude,
-            customer.longitude,
-        )
+    # One query for every customer location instead of one per customer.
+    weather_by_loc = db.get_weather_series_bulk(
+        ((c.latitude, c.longitude) for c in customers), start_time, end_time
+    )
 
-        # ------------------------------------------------------------------ #
-        # 1. Load weather data for this customer's location                   #
-        # ------------------------------------------------------------------ #
-        weather_rows = db.get_weather_series(
-            lat=customer.latitude,
-            lon=customer.longitude,
-            start=start_time,
-            end=end_time,
-        )
+    sim_cache: dict[tuple, np.ndarray] = {}
+
+    per_customer = map_customers(
+        lambda customer: _process_customer(
+            customer,
+            weather_by_loc.get((customer.latitude, customer.longitude), []),
+            target_date,
+            time_interval,
+            sim_cache,
+        ),
+        customers,
+        workers,
+    )
 
-        if not weather_rows:
-            log.warning(
-                "  No weather data for (%.4f, %.4f) on %s — skipping.  "
-                "Run etl.weather first.",
-                customer.latitude,
-                customer.longitude,
-                target_date.isoformat(),
-            )
-            continue
-
-        temperatures = [row.temperature for row in weather_rows]
-        timestamps   = [row.timestamp   for row in weather_rows]
-
-        # ------------------------------------------------------------------ #
-        # 2. Simulate facility power demand                                   #
-        # ------------------------------------------------------------------ #
-        simulator = _simulator_for_customer(customer, time_interval)
-        loads = simulator.simulate(temperatures)
-
-        # simulate() preserves length, but guard anyway
-        if len(loads) != len(timestamps):
-            log.error(
-                "  Simulator returned %d values for %d timestamps — skipping.",
-                len(loads),
-                len(timestamps),
-            )
-            continue
-
-        # ------------------------------------------------------------------ #
-        # 3. Persist                                                           #
-        # ------------------------------------------------------------------ #
-        rows = [
-            {
-                "customer_id": customer.customer_id,
-                "timestamp":   ts,
-                "power":       power,
-            }
-            for ts, power in zip(timestamps, loads)
-        ]
-
-        db.upsert_consumption_bulk(rows)
-        total_upserted += len(rows)
-        log.info(
-            "  Upserted %d rows  (%.1f kW – %.1f kW).",
-            len(rows),
-            min(loads),
-            max(loads),
-        )
+    total_upserted = upsert_streamed(db.upsert_consumption_bulk, per_customer)
 
     log.info(
         "ETL complete — %d total row(s) upserted for %s.",
@@ -120,7 +80,85 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
     )
 
 
+def _process_customer(
+    customer: Any,
+    weather_rows: list,
+    target_date: date,
+    time_interval: TimeInterval,
+    sim_cache: dict[tuple, np.ndarray],
+) -> Iterable[dict]:
+    """Simulate one customer's consumption from its location's *weather_rows*;
+    returns the rows to upsert, lazily (empty if the customer was skipped).
+
+    *sim_cache* is shared across the run so customers co-located with
+    identical simulator settings reuse one simulation.
+    """
+    cid = customer.customer_id
+    log.info(
+        "  Customer %d (%s)  loc=(%.4f, %.4f)",
+        cid,
+        customer.name,
+        customer.latitude,
+        customer.longitude,
+    )
+
+    if not weather_rows:
+        log.warning(
+            "  [customer %d] No weather data for (%.4f, %.4f) on %s — skipping.  "
+            "Run etl.weather first.",
+            cid,
+            customer.latitude,
+            customer.longitude,
+            target_date.isoformat(),
+        )
+        return []
+
+    temperatures = np.fromiter(
+        (row.temperature for row in weather_rows), dtype=np.float64, count=len(weather_rows)
+    )
+    timestamps = [row.timestamp for row in weather_rows]
+
+    # ---------------------------------------------------------------------- #
+    # 1. Simulate facility power demand                                       #
+    # ---------------------------------------------------------------------- #
+    simulator = _simulator_for_customer(customer, time_interval)
+    # Same location + same simulator ⇒ same weather in, same loads out.
+    # Simulators are cached per interval, so the instance itself is the key.
+    sim_key = (customer.latitude, customer.longitude, simulator)
+    loads = sim_cache.get(sim_key)
+    if loads is None:
+        loads = sim_cache[sim_key] = simulator.simulate_array(temperatures)
+
+    # ---------------------------------------------------------------------- #
+    # 2. Build rows; the caller persists every customer's rows together       #
+    # ---------------------------------------------------------------------- #
+    rows = (
+        {
+            "customer_id": cid,
+            "timestamp":   ts,
+            "power":       power,
+        }
+        for ts, power in zip(timestamps, loads.tolist())
+    )
+
+    log.info(
+        "  [customer %d] Simulated %d rows  (%.1f kW – %.1f kW).",
+        cid,
+        len(loads),
+        loads.min(),
+        loads.max(),
+    )
+    return rows
+
+
 def _simulator_for_customer(customer: Any, time_interval: TimeInterval) -> Any:
+    return _simulator_for_interval(time_interval)
+
+
+@functools.lru_cache(maxsize=4)
+def _simulator_for_interval(time_interval: TimeInterval) -> DatacenterSimulator:
+    # simulate() keeps no state between calls, so one instance per interval
+    # is shared by every customer and every run.
     return DatacenterSimulator(
         it_load_kw=1000.0,      # 1 MW IT load
         utilisation=0.60,
@@ -154,6 +192,7 @@ if __name__ == "__main__":
         help="Target date (default: today)",
         default=None,
     )
+    add_workers_argument(parser)
     args = parser.parse_args()
 
     target: date | None = None
@@ -164,4 +203,4 @@ if __name__ == "__main__":
             print(f"Invalid date: {args.date!r}. Expected YYYY-MM-DD.", file=sys.stderr)
             sys.exit(1)
 
-    run(target_date=target)
+    run(target_date=target, workers=args.workers)
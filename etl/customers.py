@@ -52,32 +52,35 @@ _CUSTOMERS: list[dict] = [
 
 def run() -> None:
     """Insert any missing customers.  Existing rows are never modified."""
-    inserted = 0
+    # One multi-row INSERT OR IGNORE rather than a statement per customer;
+    # RETURNING reports only the rows that were actually inserted.
+    stmt = (
+        sqlite_insert(Customer)
+        .values(_CUSTOMERS)
+        .on_conflict_do_nothing(index_elements=["customer_id"])
+        .returning(Customer.customer_id)
+    )
 
     with get_session() as db:
-        for customer in _CUSTOMERS:
-            stmt = (
-                sqlite_insert(Customer)
-                .values(**customer)
-                .on_conflict_do_nothing(index_elements=["customer_id"])
+        inserted_ids = set(db.execute(stmt).scalars())
+
+    for customer in _CUSTOMERS:
+        if customer["customer_id"] in inserted_ids:
+            log.info(
+                "Inserted customer id=%d %r (lat=%.4f, lon=%.4f)",
+                customer["customer_id"],
+                customer["name"],
+                customer["latitude"],
+                customer["longitude"],
+            )
+        else:
+            log.info(
+                "Customer id=%d %r already exists — skipped.",
+                customer["customer_id"],
+                customer["name"],
             )
-            result = db.execute(stmt)
-            if result.rowcount:
-                log.info(
-                    "Inserted customer id=%d %r (lat=%.4f, lon=%.4f)",
-                    customer["customer_id"],
-                    customer["name"],
-                    customer["latitude"],
-                    customer["longitude"],
-                )
-                inserted += 1
-            else:
-                log.info(
-                    "Customer id=%d %r already exists — skipped.",
-                    customer["customer_id"],
-                    customer["name"],
-                )
 
+    inserted = len(inserted_ids)
     log.info("Done — %d inserted, %d skipped.", inserted, len(_CUSTOMERS) - inserted)
 
 
@@ -12,13 +12,18 @@ Run from the repository root::
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import logging
 import sys
 from datetime import date, datetime, timezone
+from operator import itemgetter
+from typing import Iterable, Iterator
 
 from api.clients.openweather import OpenWeatherClient, OpenWeatherError
 from api.config import settings
 from api.db.client import DatabaseClient
+from etl.common import upsert_streamed
 from lib.time_util import interval_minutes, intervals_per_day
 from lib.types import TimeInterval
 
@@ -33,6 +38,10 @@ logging.basicConfig(
 )
 log = logging.getLogger("etl.irradiance")
 
+# Cap on in-flight Solar API requests, to stay within OpenWeather's rate
+# limits while still overlapping round-trips across locations.
+_MAX_INFLIGHT_REQUESTS = 8
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -41,8 +50,8 @@ log = logging.getLogger("etl.irradiance")
 def _current_interval_cutoff(time_interval: TimeInterval) -> datetime:
     """Return the start of the current interval (UTC, timezone-aware)."""
     now = datetime.now(tz=timezone.utc)
-    floored_minute = (now.minute // interval_minutes(time_interval)) * interval_minutes(time_interval)
-    return now.replace(minute=floored_minute, second=0, microsecond=0)
+    step = interval_minutes(time_interval)
+    return now.replace(minute=(now.minute // step) * step, second=0, microsecond=0)
 
 
 def _parse_intervals(response: dict) -> list[tuple[datetime, float]]:
@@ -64,12 +73,73 @@ def _parse_intervals(response: dict) -> list[tuple[datetime, float]]:
     return results
 
 
+def _irradiance_rows(
+    lat: float, lon: float, readings: list[tuple[datetime, float]]
+) -> Iterator[dict]:
+    """Yield the ``irradiance`` rows for one location's *readings*."""
+    for ts, ghi in readings:
+        yield {
+            "latitude": lat,
+            "longitude": lon,
+            "timestamp": ts,
+            "irradiance": ghi,
+        }
+
+
+async def _fetch_locations(
+    ow_client: OpenWeatherClient,
+    locations: list[tuple[float, float]],
+    target_date: date,
+    time_interval: TimeInterval,
+) -> list[dict | None]:
+    """Fetch the solar interval data for every location concurrently.
+
+    Returns one response per location, in order; failures are logged and
+    come back as ``None`` so the caller skips them, exactly as the serial
+    loop did.
+    """
+    semaphore = asyncio.Semaphore(_MAX_INFLIGHT_REQUESTS)
+
+    async def fetch(lat: float, lon: float) -> dict | None:
+        log.info("  Fetching irradiance for (%.4f, %.4f) …", lat, lon)
+        async with semaphore:
+            try:
+                return await ow_client.aget_solar_irradiance(
+                    lat=lat,
+                    lon=lon,
+                    day=target_date,
+                    interval=time_interval,
+                )
+            except OpenWeatherError as exc:
+                log.error(
+                    "  OpenWeather error for (%.4f, %.4f) — skipping.  "
+                    "HTTP %s: %s",
+                    lat,
+                    lon,
+                    exc.status_code,
+                    exc.message,
+                )
+            except Exception as exc:  # noqa: BLE001
+                log.error(
+                    "  Unexpected error for (%.4f, %.4f) — skipping.  %s",
+                    lat,
+                    lon,
+                    exc,
+                )
+        return None
+
+    try:
+        return await asyncio.gather(*(fetch(lat, lon) for lat, lon in locations))
+    finally:
+        await ow_client.aclose()
+
+
 # ---------------------------------------------------------------------------
 # Core ETL logic
 # ---------------------------------------------------------------------------
 
 
-def run(target_date: date | None = None, time_interval: TimeInterval = "15m") -> None:
+def run(target_date: date | None = None, time_interval: TimeInterval = "15m", db: DatabaseClient | None = None) -> None:
     if not settings.OPENWEATHER_API_KEY:
         raise RuntimeError(
             "OPENWEATHER_API_KEY is not set. "
@@ -84,8 +154,11 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
     if cutoff is not None:
         log.info("Today's run — limiting to intervals through %s UTC.", cutoff.strftime("%H:%M"))
 
-    db_client = DatabaseClient()
-    ow_client = OpenWeatherClient(api_key=settings.OPENWEATHER_API_KEY)
+    db_client = db or DatabaseClient()
+    ow_client = OpenWeatherClient(
+        api_key=settings.OPENWEATHER_API_KEY,
+        cache_path=settings.OPENWEATHER_CACHE_PATH or None,
+    )
 
     customers = db_client.list_customers()
     if not customers:
@@ -93,93 +166,54 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
         return
 
     # Deduplicate by location so we only make one API call per unique (lat, lon).
-    seen: set[tuple[float, float]] = set()
-    total_upserted = 0
+    locations = list(dict.fromkeys((c.latitude, c.longitude) for c in customers))
+    per_location: list[Iterable[dict]] = []
+    expected_readings = intervals_per_day(time_interval)
 
     try:
-        for c in customers:
-            loc = (c.latitude, c.longitude)
-            if loc in seen:
-                log.debug("  Skipping duplicate location (%.4f, %.4f).", *loc)
-                continue
-            seen.add(loc)
+        responses = asyncio.run(
+            _fetch_locations(ow_client, locations, target_date, time_interval)
+        )
+    finally:
+        ow_client.close()
 
-            log.info(
-                "  Fetching irradiance for customer %r (%.4f, %.4f) …",
-                c.name,
-                c.latitude,
-                c.longitude,
-            )
+    for (lat, lon), response in zip(locations, responses):
+        if response is None:
+            continue
 
-            try:
-                response = ow_client.get_solar_irradiance(
-                    lat=c.latitude,
-                    lon=c.longitude,
-                    day=target_date,
-                    interval=time_interval,
-                )
-            except OpenWeatherError as exc:
-                log.error(
-                    "  OpenWeather error for (%.4f, %.4f) — skipping.  "
-                    "HTTP %s: %s",
-                    c.latitude,
-                    c.longitude,
-                    exc.status_code,
-                    exc.message,
-                )
-                continue
-            except Exception as exc:  # noqa: BLE001
-                log.error(
-                    "  Unexpected error for (%.4f, %.4f) — skipping.  %s",
-                    c.latitude,
-                    c.longitude,
-                    exc,
-                )
-                continue
+        readings = _parse_intervals(response)
 
-            readings = _parse_intervals(response)
+        if cutoff is not None:
+            # Intervals arrive in chronological order, so the cutoff is a
+            # single binary search rather than a comparison per reading.
+            readings = readings[:bisect.bisect_right(readings, cutoff, key=itemgetter(0))]
+            log.info(
+                "  Trimmed to %d reading(s) through current interval (%s UTC).",
+                len(readings),
+                cutoff.strftime("%H:%M"),
+            )
+        elif len(readings) != expected_readings:
+            log.warning(
+                "  Expected %d readings but got %d for (%.4f, %.4f) — skipping.",
+                expected_readings,
+                len(readings),
+                lat,
+                lon,
+            )
+            continue
 
-            if cutoff is not None:
-                readings = [(ts, ghi) for ts, ghi in readings if ts <= cutoff]
-                log.info(
-                    "  Trimmed to %d reading(s) through current interval (%s UTC).",
-                    len(readings),
-                    cutoff.strftime("%H:%M"),
-                )
-            elif len(readings) != intervals_per_day(time_interval):
-                log.warning(
-                    "  Expected %d readings but got %d for (%.4f, %.4f) — skipping.",
-                    intervals_per_day(time_interval),
-                    len(readings),
-                    c.latitude,
-                    c.longitude,
-                )
-                continue
+        if not readings:
+            log.warning(
+                "  No readings available for (%.4f, %.4f) up to current interval — skipping.",
+                lat,
+                lon,
+            )
+            continue
 
-            if not readings:
-                log.warning(
-                    "  No readings available for (%.4f, %.4f) up to current interval — skipping.",
-                    c.latitude,
-                    c.longitude,
-                )
-                continue
-
-            rows = [
-                {
-                    "latitude": c.latitude,
-                    "longitude": c.longitude,
-                    "timestamp": ts,
-                    "irradiance": ghi,
-                }
-                for ts, ghi in readings
-            ]
-
-            db_client.upsert_irradiance_bulk(rows)
-            total_upserted += len(rows)
-            log.info("  Upserted %d rows.", len(rows))
+        per_location.append(_irradiance_rows(lat, lon, readings))
+        log.info("  Fetched %d rows for (%.4f, %.4f).", len(readings), lat, lon)
 
-    finally:
-        ow_client.close()
+    total_upserted = upsert_streamed(db_client.upsert_irradiance_bulk, per_location)
 
     log.info(
         "ETL complete — %d total row(s) upserted for %s.",
@@ -1,7 +1,9 @@
+import concurrent.futures
 import logging
 import sys
-from typing import Optional
+from typing import Callable, Optional
 
+from api.db.client import DatabaseClient
 from etl.consumption import run as run_consumption
 from etl.irradiance import run as run_irradiance
 from etl.pearson import run as run_pearson
@@ -12,51 +14,85 @@ from datetime import date
 
 log = logging.getLogger(__name__)
 
-def run_etl_chain(target_date: date) -> None:
-    """Run the full ETL pipeline for *target_date* in dependency order.
+def _run_concurrently(
+    target_date: date,
+    steps: dict[str, Callable[..., None]],
+    db: Optional[DatabaseClient] = None,
+) -> bool:
+    """Run independent *steps* for *target_date* side by side, sharing *db*.
+
+    Every step is allowed to finish; failures are logged per step.
 
-    Step 1 — irradiance    (independent source fetch)
-    Step 2 — weather       (independent source fetch, not currently used)
-    Step 3 — consumption   (depends on weather)
-    Step 4 — production    (depends on irradiance)
-    Step 5 — pearson       (depends on consumption + production)
+    Returns:
+        True if every step succeeded.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = {
+            name: pool.submit(step, target_date=target_date, db=db)
+            for name, step in steps.items()
+        }
+        ok = True
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                log.error("%s ETL failed for %s: %s", name, target_date, exc)
+                ok = False
+    return ok
+
+
+def run_source_steps(target_date: date, db: Optional[DatabaseClient] = None) -> bool:
+    """Fetch source data and run the simulations for *target_date*.
+
+    Step 1 — irradiance + weather   (independent source fetches, run together)
+    Step 2 — consumption + production
+             (consumption depends on weather, production on irradiance;
+              neither depends on the other, so they run together)
+
+    These steps only read and write rows for *target_date* itself, so
+    different days can run concurrently.
+
+    Returns:
+        True if every step succeeded, False if the chain stopped early.
     """
 
-    # -- Step 1: irradiance ----------------------------------------------
-    try:
-        run_irradiance(target_date=target_date)
-    except Exception as exc:
-        log.error("Irradiance ETL failed for %s: %s", target_date, exc)
-        return  # production and pearson depend on this
+    # -- Step 1: irradiance + weather --------------------------------------
+    # Both feed step 2 (and pearson), so stop if either failed.
+    if not _run_concurrently(
+        target_date, {"Irradiance": run_irradiance, "Weather": run_weather}, db
+    ):
+        return False
+
+    # -- Step 2: consumption + production ----------------------------------
+    # pearson depends on both.
+    return _run_concurrently(
+        target_date, {"Consumption": run_consumption, "Production": run_production}, db
+    )
 
-    # -- Step 2: weather (independent source fetch) ------------------------
-    try:
-        run_weather(target_date=target_date)
-    except Exception as exc:
-        log.error("Weather ETL failed for %s: %s", target_date, exc)
-        return  # production and pearson depends on this
 
-    # -- Step 3: consumption (depends on weather) ------------------------
-    try:
-        run_consumption(target_date=target_date)
-    except Exception as exc:
-        log.error("Consumption ETL failed for %s: %s", target_date, exc)
-        return  # pearson depends on this
+def run_correlation_step(target_date: date, db: Optional[DatabaseClient] = None) -> None:
+    """Step 5 — pearson (depends on consumption + production).
 
-    # -- Step 3: production (depends on irradiance) ----------------------
-    try:
-        run_production(target_date=target_date)
-    except Exception as exc:
-        log.error("Production ETL failed for %s: %s", target_date, exc)
-        return  # pearson depends on this
-
-    # -- Step 4: pearson (depends on consumption + production) -----------
+    The trailing 24-hour window reaches into the previous day, so this must
+    run after :func:`run_source_steps` has completed for ``target_date - 1``
+    as well as ``target_date``.
+    """
     try:
-        run_pearson(target_date=target_date)
+        run_pearson(target_date=target_date, db=db)
     except Exception as exc:
         log.error("Pearson ETL failed for %s: %s", target_date, exc)
 
 
+def run_etl_chain(target_date: date) -> None:
+    """Run the full ETL pipeline for *target_date* in dependency order.
+
+    Every stage shares one :class:`DatabaseClient` rather than building its own.
+    """
+    db = DatabaseClient()
+    if run_source_steps(target_date, db):
+        run_correlation_step(target_date, db)
+
+
 
 if __name__ == "__main__":
     import argparse
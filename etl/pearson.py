@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import logging
+import math
 import sys
+from dataclasses import dataclass
+from typing import Any, Iterable
 
+from lib.stats import sliding_pearson
 from lib.time_util import interval_timedelta, intervals_per_day
-from lib.types import TimeInterval
+from lib.types import TimeInterval, TimeSeries
 import numpy as np
 from datetime import date, datetime, time, timedelta
 
 from api.db.client import DatabaseClient
+from etl.common import DEFAULT_WORKERS, add_workers_argument, map_customers, upsert_streamed
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -23,35 +28,33 @@ log = logging.getLogger("etl.pearson")
 
 
 # ---------------------------------------------------------------------------
-# Pure-Python Pearson r
+# Core ETL logic
 # ---------------------------------------------------------------------------
 
 
-def _pearson(xs: list[float], ys: list[float]) -> float | None:
-    """Return the Pearson correlation coefficient for two equal-length lists.
-
-    Returns None if...
-    - fewer than 2 paired values are available, or
-    - either series has zero variance (constant → r is undefined).
-    """
-    if len(xs) < 2:
-        return None
+@dataclass(frozen=True)
+class _SlotGrid:
+    """Slot layout of the fetch window: slot n is ``start + n * step``."""
 
-    matrix = np.corrcoef(xs, ys) # corrcoef returns a 2x2 matrix of pairwise correlations (given that we are providing two lists)
-    r = float(matrix[0, 1]) # We want the off-diagonal (diagonals in correlation matrices are always 1)
-    return None if np.isnan(r) else r
+    start: datetime
+    step: timedelta
+    n_slots: int
+    day_offset: int          # slot of the first output timestamp
+    window_len: int          # slots per trailing window
+    output_timestamps: list[datetime]
 
 
-# ---------------------------------------------------------------------------
-# Core ETL logic
-# ---------------------------------------------------------------------------
-
-
-def run(target_date: date | None = None, time_interval: TimeInterval = "15m", lookback_window: timedelta = timedelta(hours=24)) -> None:
+def run(
+    target_date: date | None = None,
+    time_interval: TimeInterval = "15m",
+    lookback_window: timedelta = timedelta(hours=24),
+    db: DatabaseClient | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> None:
     target_date = target_date or date.today()
     log.info("Running Pearson ETL for %s", target_date.isoformat())
 
-    db = DatabaseClient()
+    db = db or DatabaseClient()
     customers = db.list_customers()
     if not customers:
         log.warning("No customers found — nothing to do.")
@@ -64,89 +67,38 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m", lo
 
     # The 96 output timestamps we produce coefficients for.
     day_start = datetime.combine(target_date, time.min)
-    output_timestamps = [day_start + interval_timedelta(time_interval) * i for i in range(intervals_per_day(time_interval))]
-
-    total_upserted = 0
-
-    for c in customers:
-        log.info("  Processing customer %r (id=%d) …", c.name, c.customer_id)
+    step = interval_timedelta(time_interval)
+    grid = _SlotGrid(
+        start=start_time,
+        step=step,
+        n_slots=(end_time - start_time) // step,
+        day_offset=(day_start - start_time) // step,
+        window_len=int(lookback_window / step),
+        output_timestamps=[day_start + step * i for i in range(intervals_per_day(time_interval))],
+    )
 
-        # ------------------------------------------------------------------
-        # Fetch all series for the two-day window and index by timestamp.
-        # ------------------------------------------------------------------
-        irr_rows = db.get_irradiance_series(
-            lat=c.latitude, lon=c.longitude, start=start_time, end=end_time
-        )
-        prod_rows = db.get_production_series(
-            customer_id=c.customer_id, start=start_time, end=end_time
-        )
-        weather_rows = db.get_weather_series(
-            lat=c.latitude, lon=c.longitude, start=start_time, end=end_time
-        )
-        cons_rows = db.get_consumption_series(
-            customer_id=c.customer_id, start=start_time, end=end_time
-        )
+    # One query per source for every customer, rather than four per customer.
+    locations = [(c.latitude, c.longitude) for c in customers]
+    customer_ids = [c.customer_id for c in customers]
+    irr_by_loc = db.get_irradiance_series_bulk(locations, start_time, end_time)
+    weather_by_loc = db.get_weather_series_bulk(locations, start_time, end_time)
+    prod_by_customer = db.get_production_series_bulk(customer_ids, start_time, end_time)
+    cons_by_customer = db.get_consumption_series_bulk(customer_ids, start_time, end_time)
+
+    per_customer = map_customers(
+        lambda c: _process_customer(
+            c,
+            irr_by_loc.get((c.latitude, c.longitude), []),
+            weather_by_loc.get((c.latitude, c.longitude), []),
+            prod_by_customer.get(c.customer_id, []),
+            cons_by_customer.get(c.customer_id, []),
+            grid,
+        ),
+        customers,
+        workers,
+    )
 
-        irr_by_ts: dict[datetime, float] = {r.timestamp: r.irradiance for r in irr_rows}
-        prod_by_ts: dict[datetime, float] = {r.timestamp: r.power for r in prod_rows}
-        temp_by_ts: dict[datetime, float] = {r.timestamp: r.temperature for r in weather_rows}
-        cons_by_ts: dict[datetime, float] = {r.timestamp: r.power for r in cons_rows}
-
-        if not irr_by_ts and not temp_by_ts:
-            log.warning(
-                "  No source data found for customer %d — skipping.", c.customer_id
-            )
-            continue
-
-        # ------------------------------------------------------------------
-        # For each output timestamp, slice the trailing 24h window and
-        # compute both Pearson coefficients.
-        # ------------------------------------------------------------------
-        output_rows: list[dict] = []
-
-        for ts in output_timestamps:
-            window_start = ts - lookback_window + interval_timedelta(time_interval)  # inclusive lower bound
-
-            # Collect timestamps in [window_start, ts] in order.
-            window_ts = [
-                window_start + interval_timedelta(time_interval) * i
-                for i in range(int(lookback_window / interval_timedelta(time_interval)))
-            ]
-
-            irr_prod_pairs = [
-                (irr_by_ts[t], prod_by_ts[t])
-                for t in window_ts
-                if t in irr_by_ts and t in prod_by_ts
-            ]
-            temp_cons_pairs = [
-                (temp_by_ts[t], cons_by_ts[t])
-                for t in window_ts
-                if t in temp_by_ts and t in cons_by_ts
-            ]
-
-            irr_vals, prod_vals = (
-                zip(*irr_prod_pairs) if irr_prod_pairs else ([], [])
-            )
-            temp_vals, cons_vals = (
-                zip(*temp_cons_pairs) if temp_cons_pairs else ([], [])
-            )
-
-            output_rows.append(
-                {
-                    "customer_id": c.customer_id,
-                    "timestamp": ts,
-                    "solar_irradiance_vs_production": _pearson(
-                        list(irr_vals), list(prod_vals)
-                    ),
-                    "temperature_vs_consumption": _pearson(
-                        list(temp_vals), list(cons_vals)
-                    ),
-                }
-            )
-
-        db.upsert_pearson_bulk(output_rows)
-        total_upserted += len(output_rows)
-        log.info("  Upserted %d rows.", len(output_rows))
+    total_upserted = upsert_streamed(db.upsert_pearson_bulk, per_customer)
 
     log.info(
         "ETL complete — %d total row(s) upserted for %s.",
@@ -155,6 +107,86 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m", lo
     )
 
 
+def _process_customer(
+    c: Any,
+    irr_rows: list,
+    weather_rows: list,
+    prod_rows: list,
+    cons_rows: list,
+    grid: _SlotGrid,
+) -> Iterable[dict]:
+    """Both rolling coefficients at every output timestamp for one customer;
+    returns the rows to upsert, lazily (empty if the customer was skipped)."""
+    log.info("  Processing customer %r (id=%d) …", c.name, c.customer_id)
+
+    if not irr_rows and not weather_rows:
+        log.warning(
+            "  No source data found for customer %d — skipping.", c.customer_id
+        )
+        return []
+
+    # Dense, slot-aligned copies of each series (NaN where missing), so
+    # every trailing window below is a slice view rather than lookups.
+    irr = _aligned(irr_rows, "irradiance", grid)
+    prod = _aligned(prod_rows, "power", grid)
+    temp = _aligned(weather_rows, "temperature", grid)
+    cons = _aligned(cons_rows, "power", grid)
+
+    output_rows = (
+        {
+            "customer_id": c.customer_id,
+            "timestamp": ts,
+            "solar_irradiance_vs_production": r_irr,
+            "temperature_vs_consumption": r_temp,
+        }
+        for ts, r_irr, r_temp in zip(
+            grid.output_timestamps,
+            _day_coefficients(irr, prod, grid),
+            _day_coefficients(temp, cons, grid),
+        )
+    )
+
+    log.info("  [customer %d] Computed %d rows.", c.customer_id, len(grid.output_timestamps))
+    return output_rows
+
+
+def _aligned(rows: list, field: str, grid: _SlotGrid) -> np.ndarray:
+    """Place each row's *field* at its slot ``(timestamp - start) / step``.
+
+    Slots are plain integer arithmetic on the ``datetime64[s]`` column, with
+    no per-row datetime objects.  Slots with no row, and rows off the slot
+    grid or outside it, are NaN.
+    """
+    series = TimeSeries.from_rows(rows, field)
+    offsets = (series.timestamps - np.datetime64(grid.start, "s")).astype(np.int64)
+    slots, rem = np.divmod(offsets, int(grid.step.total_seconds()))
+    keep = (rem == 0) & (slots >= 0) & (slots < grid.n_slots)
+
+    out = np.full(grid.n_slots, np.nan)
+    out[slots[keep]] = series.values[keep]
+    return out
+
+
+def _day_coefficients(x: np.ndarray, y: np.ndarray, grid: _SlotGrid) -> list[float | None]:
+    """Pearson coefficient of the trailing window ending at each output slot.
+
+    When either series is entirely missing or constant, every window is
+    undefined, so the sliding sums are skipped and all entries are None.
+    """
+    n_out = len(grid.output_timestamps)
+    if _is_flat(x) or _is_flat(y):
+        return [None] * n_out
+
+    r = sliding_pearson(x, y, grid.window_len)[grid.day_offset:grid.day_offset + n_out]
+    return [None if math.isnan(v) else v for v in r.tolist()]
+
+
+def _is_flat(a: np.ndarray) -> bool:
+    """True if *a* has no present values, or they are all equal."""
+    present = a[~np.isnan(a)]
+    return present.size == 0 or present.min() == present.max()
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -171,6 +203,7 @@ if __name__ == "__main__":
         help="Target date (default: today)",
         default=None,
     )
+    add_workers_argument(parser)
     args = parser.parse_args()
 
     target: date | None = None
@@ -182,7 +215,7 @@ if __name__ == "__main__":
             sys.exit(1)
 
     try:
-        run(target_date=target)
+        run(target_date=target, workers=args.workers)
     except Exception as exc:
         log.exception("Pearson ETL failed: %s", exc)
         sys.exit(1)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import functools
 import logging
 import sys
 from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable, Sequence
+
+import numpy as np
 
 from api.db.client import DatabaseClient
 from api.simulators.solar import SolarSimulator
-from lib.time_util import day_window, interval_hours, timestamps_for_day
-from lib.types import TimeInterval
+from etl.common import DEFAULT_WORKERS, add_workers_argument, map_customers, upsert_streamed
+from lib.time_util import day_window, interval_hours
+from lib.types import TimeInterval, TimeSeries
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -21,11 +26,15 @@ logging.basicConfig(
 log = logging.getLogger("etl.production")
 
 
+@functools.lru_cache(maxsize=4)
 def _simulator_for_customer(interval_hours: float) -> SolarSimulator:
     """Return a SolarSimulator configured for *customer_id*.
 
     All customers share the same defaults for now.  Replace this function
     with per-customer config loading when that data is available.
+
+    simulate() keeps no state between calls, so the instance is cached by
+    its arguments and shared across runs.
     """
     return SolarSimulator(
         installed_capacity_kw=500.0,
@@ -34,96 +43,79 @@ def _simulator_for_customer(interval_hours: float) -> SolarSimulator:
         jitter=3.0,
     )
 
+
+# A location's simulated (timestamps, power), or None if it was skipped.
+_Simulated = tuple[list[datetime], list[float]] | None
+
+
+def _map_weather_temps(
+    irradiance_ts: np.ndarray,
+    weather_rows: Sequence[Any],
+) -> np.ndarray | None:
+    """Return the ambient temperature at each irradiance timestamp.
+
+    Both series come back from the DB ordered by timestamp, so the join is a
+    single ``searchsorted`` over the weather timestamps rather than a lookup
+    per row.  Returns None when any irradiance slot has no weather reading.
+    """
+    if not weather_rows:
+        return None
+
+    weather = TimeSeries.from_rows(weather_rows, "temperature")
+    weather_ts, weather_temps = weather.timestamps, weather.values
+
+    idx = np.searchsorted(weather_ts, irradiance_ts)
+    if (idx >= len(weather_ts)).any() or (weather_ts[idx] != irradiance_ts).any():
+        return None
+
+    return weather_temps[idx]
+
 # ---------------------------------------------------------------------------
 # Core ETL logic
 # ---------------------------------------------------------------------------
 
 
-def run(target_date: date | None = None, time_interval: TimeInterval = "15m") -> None:
+def run(
+    target_date: date | None = None,
+    time_interval: TimeInterval = "15m",
+    db: DatabaseClient | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> None:
     target_date = target_date or date.today()
     log.info("Running production ETL for %s", target_date.isoformat())
 
-    db = DatabaseClient()
+    db = db or DatabaseClient()
     customers = db.list_customers()
     if not customers:
         log.warning("No customers found — nothing to do.")
         return
 
     start_time, end_time = day_window(target_date, limit_to_now=True)
-    total_upserted = 0
 
-    for c in customers:
-        log.info("  Processing customer %r (id=%d) …", c.name, c.customer_id)
+    # Irradiance (required) and weather for every location, one query each.
+    locations = [(c.latitude, c.longitude) for c in customers]
+    irr_by_loc = db.get_irradiance_series_bulk(locations, start_time, end_time)
+    weather_by_loc = db.get_weather_series_bulk(locations, start_time, end_time)
+
+    # Every customer shares the same configuration today; cached across runs.
+    simulator = _simulator_for_customer(interval_hours(time_interval))
+
+    sim_cache: dict[tuple[float, float], _Simulated] = {}
+
+    per_customer = map_customers(
+        lambda c: _process_customer(
+            c,
+            irr_by_loc.get((c.latitude, c.longitude), []),
+            weather_by_loc.get((c.latitude, c.longitude), []),
+            simulator,
+            target_date,
+            sim_cache,
+        ),
+        customers,
+        workers,
+    )
 
-        # ------------------------------------------------------------------
-        # Irradiance — required
-        # ------------------------------------------------------------------
-        irradiance_rows = db.get_irradiance_series(
-            lat=c.latitude, lon=c.longitude, start=start_time, end=end_time
-        )
-        if not irradiance_rows:
-            log.warning(
-                "  No irradiance data for (%.4f, %.4f) on %s — skipping.",
-                c.latitude,
-                c.longitude,
-                target_date,
-            )
-            continue
-
-        irradiance = [row.irradiance for row in irradiance_rows]
-
-        # ------------------------------------------------------------------
-        # Temperature — from weather table, enables NOCT derating
-        # ------------------------------------------------------------------
-        weather_rows = db.get_weather_series(
-            lat=c.latitude, lon=c.longitude, start=start_time, end=end_time
-        )
-        temperatures = [row.temperature for row in weather_rows]
-        if not temperatures and weather_rows:
-            log.warning(
-                "  Weather temperature coverage incomplete for (%.4f, %.4f) "
-                "— running without temperature derating.",
-                c.latitude,
-                c.longitude,
-            )
-        
-        if len(irradiance) != len(temperatures):
-            log.warning(
-                "  Irradiance data length (%d) does not match expected "
-                "temperatures length (%d) for customer %d — skipping.",
-                len(irradiance),
-                len(temperatures),
-                c.customer_id,
-            )
-            continue
-        
-        timestamps = timestamps_for_day(target_date, time_interval)[:len(irradiance)]
-
-        # ------------------------------------------------------------------
-        # Simulate
-        # ------------------------------------------------------------------
-        simulator = _simulator_for_customer(interval_hours(time_interval))
-        power_series = simulator.simulate(irradiance, temperatures)
-
-        # ------------------------------------------------------------------
-        # Upsert
-        # ------------------------------------------------------------------
-        rows = [
-            {
-                "customer_id": c.customer_id,
-                "timestamp": ts,
-                "power": power,
-            }
-            for ts, power in zip(timestamps, power_series)
-        ]
-
-        db.upsert_production_bulk(rows)
-        total_upserted += len(rows)
-        log.info(
-            "  Upserted %d rows (temp derating: %s).",
-            len(rows),
-            "yes" if temperatures is not None else "no",
-        )
+    total_upserted = upsert_streamed(db.upsert_production_bulk, per_customer)
 
     log.info(
         "ETL complete — %d total row(s) upserted for %s.",
@@ -132,6 +124,94 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
     )
 
 
+def _process_customer(
+    c: Any,
+    irr_rows: list,
+    weather_rows: list,
+    simulator: SolarSimulator,
+    target_date: date,
+    sim_cache: dict[tuple[float, float], _Simulated],
+) -> Iterable[dict]:
+    """Simulate one customer's production from its location's irradiance;
+    returns the rows to upsert, lazily (empty if the customer was skipped).
+
+    *sim_cache* is shared across the run: every customer uses the same
+    simulator, so co-located customers reuse one simulation.
+    """
+    log.info("  Processing customer %r (id=%d) …", c.name, c.customer_id)
+
+    # ----------------------------------------------------------------------
+    # Irradiance (required)
+    # ----------------------------------------------------------------------
+    if not irr_rows:
+        log.warning(
+            "  No irradiance data for (%.4f, %.4f) on %s — skipping.",
+            c.latitude,
+            c.longitude,
+            target_date,
+        )
+        return []
+
+    location = (c.latitude, c.longitude)
+    if location not in sim_cache:
+        sim_cache[location] = _simulate_location(irr_rows, weather_rows, simulator)
+    simulated = sim_cache[location]
+    if simulated is None:
+        log.warning(
+            "  Weather temperature coverage incomplete for (%.4f, %.4f) "
+            "— skipping customer %d.",
+            c.latitude,
+            c.longitude,
+            c.customer_id,
+        )
+        return []
+    timestamps, power_series = simulated
+
+    # ----------------------------------------------------------------------
+    # Rows; the caller upserts every customer's together
+    # ----------------------------------------------------------------------
+    rows = (
+        {
+            "customer_id": c.customer_id,
+            "timestamp": ts,
+            "power": power,
+        }
+        for ts, power in zip(timestamps, power_series)
+    )
+
+    log.info("  [customer %d] Simulated %d rows.", c.customer_id, len(timestamps))
+    return rows
+
+
+def _simulate_location(
+    irr_rows: list,
+    weather_rows: list,
+    simulator: SolarSimulator,
+) -> _Simulated:
+    """Run the simulator over one location's irradiance and weather.
+
+    Returns None unless every irradiance slot has a temperature reading:
+    production is always temperature-derated, and a day that is never re-run
+    must not be stored without it.
+    """
+    # ----------------------------------------------------------------------
+    # Temperature — from weather table, enables NOCT derating
+    # ----------------------------------------------------------------------
+    series = TimeSeries.from_rows(irr_rows, "irradiance")
+    irradiance_ts, irradiance = series.timestamps, series.values
+    temperatures = _map_weather_temps(irradiance_ts, weather_rows)
+    if temperatures is None:
+        return None
+
+    timestamps = irradiance_ts.tolist()
+
+    # ----------------------------------------------------------------------
+    # Simulate
+    # ----------------------------------------------------------------------
+    power_series = simulator.simulate(irradiance, temperatures)
+    return timestamps, power_series
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -148,6 +228,7 @@ if __name__ == "__main__":
         help="Target date (default: today)",
         default=None,
     )
+    add_workers_argument(parser)
     args = parser.parse_args()
 
     target: date | None = None
@@ -159,7 +240,7 @@ if __name__ == "__main__":
             sys.exit(1)
 
     try:
-        run(target_date=target)
+        run(target_date=target, workers=args.workers)
     except Exception as exc:
         log.exception("Production ETL failed: %s", exc)
         sys.exit(1)
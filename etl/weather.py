@@ -6,7 +6,8 @@ For each unique customer location the job:
   3. Deduplicates to hourly timestamps for API efficiency (the Time Machine
      endpoint returns hourly resolution), then fans the data out to all four
      15-minute slots within each hour.
-  4. Upserts every row into the ``weather`` table.
+  4. Upserts the rows into the ``weather`` table in batches while later
+     hours are still being fetched.
 
 Usage
 -----
@@ -16,15 +17,17 @@ Usage
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import sys
 from datetime import date, datetime, timedelta, timezone
 from typing import NamedTuple
 
-from api.clients.openweather import OpenWeatherClient, OpenWeatherError
+from api.clients.openweather import OpenWeatherClient
 from api.config import settings
 from api.db.client import DatabaseClient
-from lib.time_util import day_window, interval_minutes
+from lib.time_util import day_window, interval_timedelta
 from lib.types import TimeInterval
 
 # ---------------------------------------------------------------------------
@@ -38,6 +41,22 @@ logging.basicConfig(
 )
 log = logging.getLogger("etl.weather")
 
+# Cap on in-flight Time Machine requests across all locations, to stay within
+# OpenWeather's rate limits while still overlapping round-trips.
+_MAX_INFLIGHT_REQUESTS = 10
+
+# Locations whose coordinates agree to this many decimals (~1 km) share one
+# Time Machine call per hour; the API's own grid is coarser than that.
+_COORD_DECIMALS = 2
+
+# Rows per upsert transaction.  Small locations are combined into one write
+# and long backfills are split, so each transaction stays near this size.
+_UPSERT_BATCH_ROWS = 5000
+
+# Fetched hours waiting to be stored.  Fetches pause once this many are
+# queued, which bounds memory however long the backfill window is.
+_MAX_QUEUED_HOURS = 5000
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -55,22 +74,48 @@ def _floor_to_hour(dt: datetime) -> datetime:
 
 
 def _build_timestamps(start: datetime, end: datetime, time_interval: TimeInterval) -> list[datetime]:
-    """Return all 15-minute-aligned UTC-naive datetimes in [start, end]."""
-    timestamps: list[datetime] = []
-    current = start
-    while current < end:
-        timestamps.append(current)
-        current += timedelta(minutes=interval_minutes(time_interval))
-    return timestamps
+    """Return all 15-minute-aligned UTC-naive datetimes in [start, end)."""
+    step = interval_timedelta(time_interval)
+    n = max(0, -((start - end) // step))  # ceil((end - start) / step)
+    return [start + step * i for i in range(n)]
+
+
+# Each hour to request, paired with the slots its reading fills, in hour order.
+_HourlySlots = tuple[tuple[datetime, tuple[datetime, ...]], ...]
 
 
-def _parse_weather_row(
+@functools.lru_cache(maxsize=64)
+def _hourly_slots(start: datetime, end: datetime, time_interval: TimeInterval) -> _HourlySlots:
+    """Group the timestamp grid for [start, end) by whole hour.
+
+    Locations sharing a fetch window (always the case for a *target_date*
+    run) reuse one cached grid; it is returned as nested tuples so no caller
+    can mutate the shared copy.
+    """
+    slots = _build_timestamps(start, end, time_interval)
+    first_hour = _floor_to_hour(start)
+    # Slot i lies offset + i * step seconds past first_hour, so each hour's
+    # slots are one contiguous slice whose bounds follow by integer division.
+    offset = int((start - first_hour).total_seconds())
+    step = int(interval_timedelta(time_interval).total_seconds())
+
+    hourly: list[tuple[datetime, tuple[datetime, ...]]] = []
+    i = hour = 0
+    while i < len(slots):
+        j = -((offset - (hour + 1) * 3600) // step)  # first slot of the next hour
+        hourly.append((first_hour + timedelta(hours=hour), tuple(slots[i:j])))
+        i, hour = j, hour + 1
+    return tuple(hourly)
+
+
+def _parse_weather_payload(
     lat: float,
     lon: float,
-    timestamp: datetime,
     data: dict,
 ) -> dict:
-    """Map a Time Machine ``data[0]`` payload to a ``weather`` table row."""
+    """Map a Time Machine ``data[0]`` payload to a ``weather`` table row,
+    less its ``timestamp``: one reading fills several slots, so it is parsed
+    once and stamped per slot."""
     weather_desc = ""
     weather_list = data.get("weather", [])
     if weather_list:
@@ -79,7 +124,6 @@ def _parse_weather_row(
     return {
         "latitude": lat,
         "longitude": lon,
-        "timestamp": timestamp,
         "temperature": float(data["temp"]),
         "feels_like": float(data["feels_like"]),
         "pressure": int(data["pressure"]),
@@ -94,20 +138,185 @@ def _parse_weather_row(
     }
 
 
+_RequestKey = tuple[float, float, datetime]
+
+
+async def _fetch_hours(
+    weather_client: OpenWeatherClient,
+    semaphore: asyncio.Semaphore,
+    requests: dict[_RequestKey, asyncio.Future],
+    lat: float,
+    lon: float,
+    hourly_slots: _HourlySlots,
+    sink: asyncio.Queue,
+) -> int:
+    """Fetch every hour in *hourly_slots* concurrently, fan each reading out
+    to its 15-minute slots and put each hour's rows on *sink* as it arrives.
+    Returns the number of rows produced.
+
+    *requests* is shared by every location in the run: a location whose
+    rounded coordinates and hour were already requested awaits that call
+    instead of making its own.
+
+    Hours that fail or return no data are skipped.  They are counted and
+    logged once per location, with the earliest such hour as a sample, so a
+    rate-limit storm costs one log line rather than one per hour.
+    """
+    failed: list[tuple[datetime, Exception]] = []
+    empty: list[datetime] = []
+
+    async def call(hour_ts: datetime) -> dict | Exception:
+        async with semaphore:
+            try:
+                return await weather_client.aget_timemachine(
+                    lat=lat,
+                    lon=lon,
+                    dt=hour_ts.replace(tzinfo=timezone.utc),
+                )
+            except Exception as exc:  # noqa: BLE001
+                return exc
+
+    async def fetch(hour_ts: datetime, slot_timestamps: tuple[datetime, ...]) -> int:
+        key = (round(lat, _COORD_DECIMALS), round(lon, _COORD_DECIMALS), hour_ts)
+        if key not in requests:
+            requests[key] = asyncio.ensure_future(call(hour_ts))
+        response = await requests[key]
+        if isinstance(response, Exception):
+            failed.append((hour_ts, response))
+            return 0
+
+        data_points = response.get("data", [])
+        if not data_points:
+            empty.append(hour_ts)
+            return 0
+
+        # Fan the single hourly reading out to all 15-min slots.
+        parsed = _parse_weather_payload(lat, lon, data_points[0])
+        rows = [{**parsed, "timestamp": slot_ts} for slot_ts in slot_timestamps]
+        await sink.put(rows)
+        return len(rows)
+
+    # TODO: limit total calls by only fetching on published intervals
+    counts = await asyncio.gather(
+        *(fetch(hour_ts, slot_timestamps) for hour_ts, slot_timestamps in hourly_slots)
+    )
+
+    if failed:
+        hour_ts, exc = min(failed, key=lambda f: f[0])
+        log.error(
+            "  (%.4f, %.4f): %d/%d hour(s) failed — skipped.  First at %s: %s",
+            lat,
+            lon,
+            len(failed),
+            len(hourly_slots),
+            hour_ts.isoformat(),
+            exc,
+        )
+    if empty:
+        log.warning(
+            "  (%.4f, %.4f): no data returned for %d hour(s) — skipped.  First at %s.",
+            lat,
+            lon,
+            len(empty),
+            min(empty).isoformat(),
+        )
+    return sum(counts)
+
+
+async def _fetch_locations(
+    weather_client: OpenWeatherClient,
+    plans: list[tuple[_Location, _HourlySlots]],
+    sink: asyncio.Queue,
+) -> list[int]:
+    """Run :func:`_fetch_hours` for every planned location concurrently,
+    sharing one in-flight cap, one request table and one *sink*; returns
+    each location's row count, in order."""
+    semaphore = asyncio.Semaphore(_MAX_INFLIGHT_REQUESTS)
+    requests: dict[_RequestKey, asyncio.Future] = {}
+    try:
+        per_location = await asyncio.gather(
+            *(
+                _fetch_hours(
+                    weather_client, semaphore, requests, loc.latitude, loc.longitude, hourly_slots, sink
+                )
+                for loc, hourly_slots in plans
+            )
+        )
+    finally:
+        await weather_client.aclose()
+
+    wanted = sum(len(hourly_slots) for _, hourly_slots in plans)
+    log.info(
+        "Time Machine: %d request(s) for %d location-hour(s) (%d shared).",
+        len(requests),
+        wanted,
+        wanted - len(requests),
+    )
+    return per_location
+
+
+async def _store_rows(db_client: DatabaseClient, source: asyncio.Queue) -> int:
+    """Drain *source* until its ``None`` sentinel, upserting in batches of
+    about :data:`_UPSERT_BATCH_ROWS` rows; returns the rows upserted.
+
+    Each upsert runs in a worker thread, so fetches keep going meanwhile.
+    """
+    total = 0
+    batch: list[dict] = []
+    while (rows := await source.get()) is not None:
+        batch.extend(rows)
+        if len(batch) >= _UPSERT_BATCH_ROWS:
+            total += await asyncio.to_thread(db_client.upsert_weather_bulk, batch)
+            batch = []
+    if batch:
+        total += await asyncio.to_thread(db_client.upsert_weather_bulk, batch)
+    return total
+
+
+async def _fetch_and_store(
+    weather_client: OpenWeatherClient,
+    db_client: DatabaseClient,
+    plans: list[tuple[_Location, _HourlySlots]],
+) -> tuple[list[int], int]:
+    """Fetch every planned location while storing rows as they arrive.
+
+    Returns each location's fetched row count and the total rows upserted.
+    """
+    queue: asyncio.Queue[list[dict] | None] = asyncio.Queue(maxsize=_MAX_QUEUED_HOURS)
+
+    async def produce() -> list[int]:
+        try:
+            return await _fetch_locations(weather_client, plans, queue)
+        finally:
+            # Cancelled only once the consumer has failed: nobody is left to
+            # read the sentinel, and the queue may be full.
+            if not asyncio.current_task().cancelling():
+                await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        total = await _store_rows(db_client, queue)
+    except BaseException:
+        producer.cancel()
+        # Let the fetches unwind (and the client close) before re-raising.
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+    return await producer, total
+
+
 # ---------------------------------------------------------------------------
 # Core ETL logic
 # ---------------------------------------------------------------------------
 
 
-def run(target_date: date | None = None, time_interval: TimeInterval = "15m") -> None:
+def run(target_date: date | None = None, time_interval: TimeInterval = "15m", db: DatabaseClient | None = None) -> None:
     if not settings.OPENWEATHER_API_KEY:
         raise RuntimeError(
             "OPENWEATHER_API_KEY is not set. "
             "Export the variable before running this job."
         )
 
-    db_client = DatabaseClient()
-    weather_client = OpenWeatherClient(api_key=settings.OPENWEATHER_API_KEY)
+    db_client = db or DatabaseClient()
 
     customers = db_client.list_customers()
     if not customers:
@@ -124,7 +333,15 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
         datetime.min.time(),
     )
 
-    total_upserted = 0
+    # Without a target date each location resumes after its own last row;
+    # look them all up in one query rather than one per location.
+    last_stored = (
+        {} if target_date else db_client.get_last_weather_timestamps(locations)
+    )
+
+    # Plan every location's fetch window first, then fetch
+    # all of them in one event loop so locations overlap as well as hours.
+    plans: list[tuple[_Location, _HourlySlots]] = []
 
     for loc in locations:
         lat, lon = loc.latitude, loc.longitude
@@ -136,10 +353,10 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
         if target_date:
             start_dt, end_dt = day_window(target_date, limit_to_now=True)
         else:
-            last_ts = db_client.get_last_weather_timestamp(lat, lon)
+            last_ts = last_stored.get(loc)
             if last_ts is not None:
                 # Resume from the next 15-minute slot after the last stored row.
-                start_dt = last_ts + timedelta(minutes=interval_minutes(time_interval))
+                start_dt = last_ts + interval_timedelta(time_interval)
                 log.info("  Resuming from %s", start_dt.isoformat())
             else:
                 start_dt = backfill_start
@@ -152,60 +369,37 @@ def run(target_date: date | None = None, time_interval: TimeInterval = "15m") ->
             continue
 
         # ------------------------------------------------------------------
-        # Step 2 — build the timestamp grid
-        # ------------------------------------------------------------------
-        timestamps = _build_timestamps(start_dt, end_dt, time_interval)
-        log.info("  %d timestamps to fill (%.1f hours)", len(timestamps), len(timestamps) / 4)
-
-        # Deduplicate to unique hours so we make one API call per hour.
-        unique_hours: dict[datetime, list[datetime]] = {}
-        for ts in timestamps:
-            hour = _floor_to_hour(ts)
-            unique_hours.setdefault(hour, []).append(ts)
-
-        # ------------------------------------------------------------------
-        # Step 3 — fetch from Time Machine and store
+        # Step 2 — build the timestamp grid, deduplicated to unique hours so
+        # we make one API call per hour
         # ------------------------------------------------------------------
-        rows: list[dict] = []
+        hourly_slots = _hourly_slots(start_dt, end_dt, time_interval)
+        n_slots = sum(len(slots) for _, slots in hourly_slots)
+        log.info("  %d timestamps to fill (%.1f hours)", n_slots, n_slots / 4)
 
-        for hour_ts, slot_timestamps in sorted(unique_hours.items()): # TODO: limit total calls by only fetching on published intervals
-            try:
-                response = weather_client.get_timemachine(
-                    lat=lat,
-                    lon=lon,
-                    dt=hour_ts.replace(tzinfo=timezone.utc),
-                )
-            except OpenWeatherError as exc:
-                log.error(
-                    "  OpenWeather error for %s — skipping hour.  HTTP %s: %s",
-                    hour_ts.isoformat(),
-                    exc.status_code,
-                    exc.message,
-                )
-                continue
-            except Exception as exc:  # noqa: BLE001
-                log.error(
-                    "  Unexpected error for %s — skipping hour.  %s",
-                    hour_ts.isoformat(),
-                    exc,
-                )
-                continue
+        plans.append((loc, hourly_slots))
 
-            data_points = response.get("data", [])
-            if not data_points:
-                log.warning("  No data returned for %s — skipping hour.", hour_ts.isoformat())
-                continue
+    # ----------------------------------------------------------------------
+    # Step 3 — fetch from Time Machine and store
+    # ----------------------------------------------------------------------
+    if not plans:
+        log.info("ETL complete — 0 total row(s) upserted.")
+        return
 
-            # Fan the single hourly reading out to all 15-min slots.
-            for slot_ts in slot_timestamps:
-                rows.append(_parse_weather_row(lat, lon, slot_ts, data_points[0]))
+    # Hours more than a day old are final, so restarts and overlapping
+    # backfills read them from the on-disk response cache.
+    weather_client = OpenWeatherClient(
+        api_key=settings.OPENWEATHER_API_KEY,
+        cache_path=settings.OPENWEATHER_CACHE_PATH or None,
+    )
+    try:
+        per_location, total_upserted = asyncio.run(
+            _fetch_and_store(weather_client, db_client, plans)
+        )
+    finally:
+        weather_client.close()
 
-        if rows:
-            db_client.upsert_weather_bulk(rows)
-            total_upserted += len(rows)
-            log.info("  Upserted %d row(s).", len(rows))
-        else:
-            log.info("  No rows to upsert.")
+    for (loc, _), n_rows in zip(plans, per_location):
+        log.info("  (%.4f, %.4f): fetched %d row(s).", loc.latitude, loc.longitude, n_rows)
 
     log.info("ETL complete — %d total row(s) upserted.", total_upserted)
 
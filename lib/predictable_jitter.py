@@ -1,6 +1,40 @@
-from hashlib import sha256
+import struct
+
+import numpy as np
+
+_MASK64 = (1 << 64) - 1
+_SPAN = 100 * 2 + 1
+
+def _splitmix64(x: int) -> int:
+    """SplitMix64 finaliser: a cheap, well-mixed non-cryptographic 64-bit hash."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
 
 def predictable_jitter(input: float, jitter_range: float = 10.0, round_to: int = 2) -> int:
-    normalized_jitter = int(sha256(str(input).encode()).hexdigest(), 16) % (100 * 2 + 1) - 100
+    bits = struct.unpack("<Q", struct.pack("<d", float(input)))[0]
+    normalized_jitter = _splitmix64(bits) % _SPAN - 100
+
+    return round(normalized_jitter * jitter_range / 100, round_to)
+
+def predictable_jitter_vec(inputs: np.ndarray, jitter_range: float = 10.0, round_to: int = 2) -> np.ndarray:
+    """:func:`predictable_jitter` applied element-wise, as a float64 array.
+
+    The hash runs on the raw float bits in uint64 arithmetic (which wraps like
+    the masked scalar version), and the rounded jitter is looked up from the
+    201 possible steps so it matches the scalar ``round`` exactly.
+    """
+    inputs = np.ascontiguousarray(inputs, dtype=np.float64)
+    if not jitter_range:
+        return np.zeros(inputs.shape, dtype=np.float64)
+
+    x = inputs.view(np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
 
-    return round(normalized_jitter * jitter_range / 100, round_to)
\ No newline at end of file
+    table = np.array(
+        [round((k - 100) * jitter_range / 100, round_to) for k in range(_SPAN)],
+        dtype=np.float64,
+    )
+    return table[(x % np.uint64(_SPAN)).astype(np.intp)]
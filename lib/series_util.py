@@ -1,59 +1,66 @@
 from __future__ import annotations
-from copy import deepcopy
+from copy import copy
 from typing import Callable, Optional, TypeVar
 
-from lib.types import TimeSeriesPoint
+import numpy as np
+
+from lib.types import TimeSeries, TimeSeriesPoint
 
 Container = TypeVar("Any")
 
-#TODO: This is slow, because we're going through the list 3 times. Update it to do all the work in one pass.
 def interpolate_any(points: list[Container], getter: Callable[[Container], Optional[float]], setter: Callable[[Container, float], None]) -> list[Container]:
-    points_copy = deepcopy(points)
-    
-    raw_points = [getter(p) for p in points_copy]
-    interpolated_values = interpolate(raw_points)
-    for p, value in zip(points_copy, interpolated_values):
+    """Interpolate the values read by *getter* and write them with *setter*
+    into shallow copies of *points*; the input objects are left untouched."""
+    values = interpolate([getter(p) for p in points])
+    points_copy = []
+    for p, value in zip(points, values):
+        p = copy(p)
         setter(p, value)
+        points_copy.append(p)
     return points_copy
 
 def interpolate(points: list[Optional[float]]) -> list[float]:
-    if not points:
-        return []
-    
-    i = 0
-
-    points_copy = points.copy() # avoid mutating the input list
+    """Fill each run of ``None`` linearly between its known neighbours.
 
-    while i < len(points_copy):
-        if points_copy[i] is not None:
-            i += 1
-            continue
+    Runs at either end take the nearest known value; with no known values at
+    all the points are returned unchanged.  See :func:`interpolate_array`.
+    """
+    values = interpolate_array(np.array([np.nan if p is None else p for p in points], dtype=np.float64))
+    if np.isnan(values).all():
+        return points.copy() # avoid handing back the caller's list
+    return values.tolist()
 
-        # Find the next non-None value to the right (if any)
-        j = i + 1
-        while j < len(points_copy) and points_copy[j] is None:
-            j += 1
+def interpolate_array(values: np.ndarray) -> np.ndarray:
+    """:func:`interpolate` on a float array whose gaps are NaN; returns a new
+    array.  A single ``np.interp`` over the known positions fills every gap
+    at once, so columnar series never need to become point objects.
+    """
+    values = np.array(values, dtype=np.float64)
+    known = ~np.isnan(values)
+    if known.all() or not known.any():
+        return values
 
-        left = points_copy[i - 1] if i > 0 else None
-        right = points_copy[j] if j < len(points_copy) else None
-        steps = j - i
-
-        interpolated_values = interpolate_steps(left, right, steps)
-        points_copy[i:j] = interpolated_values
-        i = j
-
-    return points_copy
+    idx = np.arange(len(values))
+    values[~known] = np.interp(idx[~known], idx[known], values[known])
+    return values
 
 def interpolate_steps(left: Optional[float], right: Optional[float], steps: int) -> list[float]:
     if left is None or right is None:
         return [left if left is not None else right] * steps
 
-    step_size = (right - left) / (steps + 1)
-    return [left + step_size * (i + 1) for i in range(steps)]
+    # The interior points of an evenly spaced run from left to right.
+    return np.linspace(left, right, steps + 2)[1:-1].tolist()
+
+def interpolate_time_series(points: list[TimeSeriesPoint] | TimeSeries) -> list[TimeSeriesPoint] | TimeSeries:
+    """Fill the gaps in a series, returning the same kind of series.
+
+    A columnar :class:`TimeSeries` (NaN marks a gap) is filled on its value
+    array and shares the input's timestamp array; a list of points yields
+    new points.
+    """
+    if isinstance(points, TimeSeries):
+        return TimeSeries(timestamps=points.timestamps, values=interpolate_array(points.values))
 
-def interpolate_time_series(points: list[TimeSeriesPoint]) -> list[TimeSeriesPoint]:
-    return interpolate_any(
-        points,
-        getter=lambda p: p.value,
-        setter=lambda p, v: setattr(p, "value", v),
-    )
\ No newline at end of file
+    # Specialised interpolate_any: new points built directly, no getter/setter.
+    values = interpolate([p.value for p in points])
+    return [TimeSeriesPoint(p.timestamp, value) for p, value in zip(points, values)]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+# Windows whose spread is below this fraction of their raw sum of squares are
+# treated as constant; the prefix-sum differences can leave a few ulps of
+# residue where an exact computation would give zero variance.
+_ZERO_VARIANCE_RTOL = 1e-12
+
+
+def sliding_pearson(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """Pearson coefficient of every trailing *window* of two aligned series.
+
+    Element ``i`` of the result is the coefficient over
+    ``x[i - window + 1 : i + 1]`` (clipped at the start), using only the
+    positions where both series are present (not NaN).  It is NaN wherever
+    the coefficient is undefined: fewer than two such pairs, or either series
+    constant over the window.
+
+    All windows come from prefix sums of ``x``, ``y``, ``xy``, ``x²`` and
+    ``y²``, so the cost is linear in the series length rather than in
+    length × window.  Each series is shifted by its first present value
+    first, which keeps the sums small and the variances free of cancellation.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if not valid.any():
+        return np.full(x.shape, np.nan)
+
+    xs = np.where(valid, x - x[valid][0], 0.0)
+    ys = np.where(valid, y - y[valid][0], 0.0)
+
+    # One prefix-sum row per statistic, with a leading zero column so that
+    # window sums are sums[:, end] - sums[:, start].
+    stats = np.stack([valid.astype(np.float64), xs, ys, xs * ys, xs * xs, ys * ys])
+    sums = np.zeros((stats.shape[0], stats.shape[1] + 1))
+    np.cumsum(stats, axis=1, out=sums[:, 1:])
+
+    ends = np.arange(1, x.size + 1)
+    starts = np.maximum(ends - window, 0)
+    n, sx, sy, sxy, sxx, syy = sums[:, ends] - sums[:, starts]
+
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    defined = (
+        (n >= 2)
+        & (var_x > _ZERO_VARIANCE_RTOL * n * sxx)
+        & (var_y > _ZERO_VARIANCE_RTOL * n * syy)
+    )
+
+    r = np.full(x.shape, np.nan)
+    r[defined] = (n * sxy - sx * sy)[defined] / np.sqrt(var_x[defined] * var_y[defined])
+    return np.clip(r, -1.0, 1.0, out=r)
@@ -1,4 +1,9 @@
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, time
+from functools import lru_cache
+
+import numpy as np
+
 from lib.types import TimeInterval
 from lib.constants import MINUTES_IN_HOUR, HOURS_IN_DAY
 
@@ -8,29 +13,56 @@ INTERVAL_MINUTES: dict[TimeInterval, int] = {
     "15m": 15,
 }
 
+@dataclass(frozen=True)
+class _IntervalSpec:
+    """Every derived quantity of one interval, computed once at import."""
+
+    minutes: int
+    hours: float
+    downsample_factor: float
+    per_day: int
+    step: timedelta
+
+_INTERVAL_SPECS: dict[TimeInterval, _IntervalSpec] = {
+    name: _IntervalSpec(
+        minutes=minutes,
+        hours=minutes / MINUTES_IN_HOUR,
+        downsample_factor=MINUTES_IN_HOUR / minutes,
+        per_day=int(HOURS_IN_DAY / (minutes / MINUTES_IN_HOUR)),
+        step=timedelta(minutes=minutes),
+    )
+    for name, minutes in INTERVAL_MINUTES.items()
+}
+
 def interval_hours(time_slice: TimeInterval) -> float:
-    return INTERVAL_MINUTES[time_slice] / MINUTES_IN_HOUR
+    return _INTERVAL_SPECS[time_slice].hours
 
 def downsample_factor(time_slice: TimeInterval) -> int:
-    return MINUTES_IN_HOUR / INTERVAL_MINUTES[time_slice]
+    return _INTERVAL_SPECS[time_slice].downsample_factor
 
 def interval_minutes(time_slice: TimeInterval) -> int:
-    return INTERVAL_MINUTES[time_slice]
+    return _INTERVAL_SPECS[time_slice].minutes
 
 def intervals_per_day(time_slice: TimeInterval) -> int:
-    return int(HOURS_IN_DAY / interval_hours(time_slice))
+    return _INTERVAL_SPECS[time_slice].per_day
 
 def interval_timedelta(time_slice: TimeInterval) -> timedelta:
-    return timedelta(minutes=interval_minutes(time_slice))
+    return _INTERVAL_SPECS[time_slice].step
 
 def date_to_datetime(d: date) -> datetime:
     """Return midnight UTC for *d* as a timezone-naive datetime."""
     return datetime.combine(d, time.min)
 
+@lru_cache(maxsize=4096)
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
 def day_window(day: date, limit_to_now: bool = True) -> tuple[datetime, datetime]:
     """Return (start, end) datetime pair covering every 15-min slot in *day*."""
-    start = datetime.combine(day, time.min)
-    end = start + timedelta(days=1)
+    # Only the fixed midnight bounds are memoised; the clamp to "now" below
+    # has to be re-evaluated on every call.
+    start, end = _day_bounds(day)
 
     if limit_to_now:
         now = datetime.now()
@@ -39,6 +71,13 @@ def day_window(day: date, limit_to_now: bool = True) -> tuple[datetime, datetime
 
     return start, end
 
+@lru_cache(maxsize=4096)
+def _day_slots(day: date, time_interval: TimeInterval) -> tuple[datetime, ...]:
+    # Minute offsets from midnight, converted to datetimes in one C pass.
+    spec = _INTERVAL_SPECS[time_interval]
+    midnight = np.datetime64(day, "m")
+    return tuple((midnight + np.arange(spec.per_day) * spec.minutes).tolist())
+
 def timestamps_for_day(day: date, time_interval: TimeInterval) -> list[datetime]:
-    start = datetime.combine(day, time.min)
-    return [start + interval_timedelta(time_interval) * i for i in range(intervals_per_day(time_interval))]
\ No newline at end of file
+    # The grid is memoised as a tuple; each caller gets its own list.
+    return list(_day_slots(day, time_interval))
\ No newline at end of file
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Dict, Literal, Optional
+from typing import Any, Dict, Literal, Optional, Sequence
+
+import numpy as np
 
 
 TimeInterval = Literal["hourly", "30m", "15m"]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DailyProfile:
     morning: float
     afternoon: float
@@ -15,18 +17,57 @@ class DailyProfile:
     t_max: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeSeriesPoint:
     timestamp: datetime
     value: float
 
 
+@dataclass(slots=True)
+class TimeSeries:
+    """Column-oriented series: parallel ``datetime64[s]`` and ``float64`` arrays.
+
+    Two contiguous buffers instead of one :class:`TimeSeriesPoint` object per
+    sample; convert at the edges with :meth:`to_points` / :meth:`from_points`.
+    """
+
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any], value_attr: str) -> "TimeSeries":
+        """Build from DB rows exposing ``timestamp`` and *value_attr*."""
+        n = len(rows)
+        return cls(
+            timestamps=np.fromiter((r.timestamp for r in rows), dtype="datetime64[s]", count=n),
+            values=np.fromiter((getattr(r, value_attr) for r in rows), dtype=np.float64, count=n),
+        )
+
+    @classmethod
+    def from_columns(cls, timestamps: Sequence[datetime], values: Sequence[float]) -> "TimeSeries":
+        """Build from parallel timestamp and value sequences."""
+        return cls(
+            timestamps=np.array(timestamps, dtype="datetime64[s]"),
+            values=np.array(values, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_points(cls, points: Sequence[TimeSeriesPoint]) -> "TimeSeries":
+        return cls.from_rows(points, "value")
+
+    def to_points(self) -> list[TimeSeriesPoint]:
+        return list(map(TimeSeriesPoint, self.timestamps.tolist(), self.values.tolist()))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
 @dataclass
 class HistoricalData:
     customer_id: int
     date: date
-    production: list[TimeSeriesPoint]
-    consumption: list[TimeSeriesPoint]
-    temperature: list[TimeSeriesPoint]
-    irradiance: list[TimeSeriesPoint]
+    production: TimeSeries
+    consumption: TimeSeries
+    temperature: TimeSeries
+    irradiance: TimeSeries
     correlation: Optional[Dict[str, Optional[float]]]
\ No newline at end of file
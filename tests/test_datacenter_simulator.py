@@ -1,8 +1,9 @@
 """Basic tests for api.simulators.datacenter.DatacenterSimulator."""
 
+import numpy as np
 import pytest
 
-from api.simulators.datacenter import DatacenterSimulator
+from api.simulators.datacenter import DatacenterSimulator, _ema
 
 
 # ---------------------------------------------------------------------------
@@ -99,6 +100,18 @@ def test_t_initial_overrides_first_step(sim):
     assert result_hot_init[0] > result_default[0]
 
 
+def test_simulate_array_matches_simulate(sim):
+    temps = [5.0, 18.0, 26.0, 31.0, 22.0]
+    result = sim.simulate_array(temps)
+    assert result.dtype == np.float64
+    assert result.tolist() == sim.simulate(temps)
+
+
+def test_simulate_array_rejects_2d_input(sim):
+    with pytest.raises(ValueError, match="temperatures must be one-dimensional"):
+        sim.simulate_array(np.zeros((2, 3)))
+
+
 # ---------------------------------------------------------------------------
 # Properties / convenience
 # ---------------------------------------------------------------------------
@@ -129,3 +142,18 @@ def test_steady_state_load_below_setpoint_equals_base(sim):
     assert sim.steady_state_load(sim.temp_setpoint - 5.0) == pytest.approx(
         sim.it_load_kw * sim.utilisation * sim.pue_base
     )
+
+
+# ---------------------------------------------------------------------------
+# Vectorised lag filter
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("k", [0.02, 0.25, 0.9, 1.0])
+def test_ema_matches_scalar_recursion(k):
+    temps = [10.0 + 15.0 * ((i * 37) % 11) / 10.0 for i in range(500)]
+    expected, y = [], 12.0
+    for t in temps:
+        y += k * (t - y)
+        expected.append(y)
+    assert _ema(np.array(temps), k, 12.0).tolist() == pytest.approx(expected, rel=1e-12)
@@ -1,8 +1,9 @@
 """Tests for lib.predictable_jitter."""
 
+import numpy as np
 import pytest
 
-from lib.predictable_jitter import predictable_jitter
+from lib.predictable_jitter import predictable_jitter, predictable_jitter_vec
 
 
 # ---------------------------------------------------------------------------
@@ -80,3 +81,32 @@ def test_close_inputs_may_differ():
     b = predictable_jitter(2.0)
     # Values are hash-derived so they should differ for distinct floats
     assert a != b
+
+
+# ---------------------------------------------------------------------------
+# Vectorised variant
+# ---------------------------------------------------------------------------
+
+
+def test_vec_matches_scalar():
+    values = [0.0, 1.5, -3.25, 1.5, 22.0, 0.0, -0.0, 1000.0]
+    expected = [predictable_jitter(v, 5, 2) for v in values]
+    assert predictable_jitter_vec(np.array(values), 5, 2).tolist() == expected
+
+
+def test_vec_zero_range_is_zero():
+    assert predictable_jitter_vec(np.array([1.0, 2.0]), 0, 2).tolist() == [0.0, 0.0]
+
+
+def test_vec_empty():
+    assert predictable_jitter_vec(np.array([]), 5, 2).size == 0
+
+
+def test_int_and_float_inputs_agree():
+    assert predictable_jitter(3) == predictable_jitter(3.0)
+
+
+def test_vec_matches_scalar_on_many_values():
+    values = np.random.default_rng(0).normal(scale=50.0, size=1000)
+    expected = [predictable_jitter(v, 7.5, 1) for v in values.tolist()]
+    assert predictable_jitter_vec(values, 7.5, 1).tolist() == expected
@@ -0,0 +1,46 @@
+"""Tests for api.clients.response_cache.ResponseCache."""
+
+import pytest
+
+from api.clients.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    c = ResponseCache(tmp_path / "nested" / "cache.db")
+    yield c
+    c.close()
+
+
+def test_miss_returns_none(cache):
+    assert cache.get("missing") is None
+
+
+def test_round_trip(cache):
+    body = {"irradiance": {"intervals": [{"start": "00:00", "ghi": 0.0}]}}
+    cache.set("k", body)
+    assert cache.get("k") == body
+
+
+def test_set_overwrites(cache):
+    cache.set("k", {"v": 1})
+    cache.set("k", {"v": 2})
+    assert cache.get("k") == {"v": 2}
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    first = ResponseCache(path)
+    first.set("k", {"v": 1})
+    first.close()
+
+    second = ResponseCache(path)
+    assert second.get("k") == {"v": 1}
+    second.close()
+
+
+def test_make_key_ignores_param_order_and_none():
+    a = ResponseCache.make_key("/p", lat=1.0, lon=2.0, tz=None)
+    b = ResponseCache.make_key("/p", lon=2.0, lat=1.0)
+    assert a == b
+    assert a != ResponseCache.make_key("/q", lat=1.0, lon=2.0)
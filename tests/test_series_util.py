@@ -1,14 +1,15 @@
-"""Tests for lib.series_util — interpolate_steps, interpolate, and interpolate_time_series."""
+"""Tests for lib.series_util — interpolate_steps, interpolate, interpolate_array and interpolate_time_series."""
 
 from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import Optional
 
+import numpy as np
 import pytest
 
-from lib.series_util import interpolate, interpolate_steps, interpolate_time_series
-from lib.types import TimeSeriesPoint
+from lib.series_util import interpolate, interpolate_array, interpolate_steps, interpolate_time_series
+from lib.types import TimeSeries, TimeSeriesPoint
 
 
 # ---------------------------------------------------------------------------
@@ -250,3 +251,30 @@ def test_interpolate_time_series_single_point():
     points = [make_point(0, 42.0)]
     result = interpolate_time_series(points)
     assert result[0].value == pytest.approx(42.0)
+
+
+# ---------------------------------------------------------------------------
+# interpolate_array
+# ---------------------------------------------------------------------------
+
+
+def test_interpolate_array_fills_nan_gaps():
+    values = np.array([np.nan, 1.0, np.nan, 3.0, np.nan])
+    assert interpolate_array(values).tolist() == pytest.approx([1.0, 1.0, 2.0, 3.0, 3.0])
+
+
+def test_interpolate_array_does_not_mutate_input():
+    values = np.array([0.0, np.nan, 2.0])
+    result = interpolate_array(values)
+    assert result is not values
+    assert np.isnan(values[1])
+
+
+def test_interpolate_time_series_columnar():
+    stamps = [datetime(2026, 2, 25, hour) for hour in range(3)]
+    series = TimeSeries.from_columns(stamps, [0.0, np.nan, 4.0])
+    result = interpolate_time_series(series)
+    assert isinstance(result, TimeSeries)
+    assert result.values.tolist() == pytest.approx([0.0, 2.0, 4.0])
+    assert result.timestamps is series.timestamps
+    assert np.isnan(series.values[1])
@@ -1,5 +1,6 @@
 """Basic tests for api.simulators.solar.SolarSimulator."""
 
+import numpy as np
 import pytest
 
 from api.simulators.solar import SolarSimulator
@@ -93,6 +94,21 @@ def test_high_temperature_reduces_output(sim):
     assert cool[0] > hot[0]
 
 
+def test_array_inputs_match_list_inputs(sim):
+    irr = [-5.0, 0.0, 350.0, 1000.0]
+    temps = [5.0, 12.0, 24.0, 38.0]
+    expected = sim.simulate(irr, temperatures=temps)
+    assert sim.simulate(np.array(irr), temperatures=np.array(temps)) == expected
+
+
+def test_simulate_array_matches_simulate(sim):
+    irr = [0.0, 350.0, 1000.0]
+    temps = [12.0, 24.0, 38.0]
+    result = sim.simulate_array(irr, temps)
+    assert result.dtype == np.float64
+    assert result.tolist() == sim.simulate(irr, temps)
+
+
 # ---------------------------------------------------------------------------
 # peak_output_kw
 # ---------------------------------------------------------------------------
@@ -0,0 +1,88 @@
+"""Tests for lib.stats.sliding_pearson."""
+
+import numpy as np
+import pytest
+
+from lib.stats import sliding_pearson
+
+
+def _reference_pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """Plain Pearson r over the pairs where both values are present (NaN if undefined)."""
+    mask = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[mask], y[mask]
+    if x.size < 2 or np.ptp(x) == 0.0 or np.ptp(y) == 0.0:
+        return np.nan
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+def _full_window(x, y) -> float:
+    """Coefficient of the one window spanning the whole series."""
+    return sliding_pearson(x, y, len(x))[-1]
+
+
+# ---------------------------------------------------------------------------
+# Undefined cases
+# ---------------------------------------------------------------------------
+
+
+def test_single_value_is_nan():
+    assert np.isnan(_full_window([1.0], [2.0]))
+
+
+def test_constant_series_is_nan():
+    assert np.isnan(_full_window([3.0, 3.0, 3.0], [1.0, 2.0, 3.0]))
+    assert np.isnan(_full_window([1.0, 2.0, 3.0], [0.0, 0.0, 0.0]))
+
+
+def test_sliding_undefined_windows_are_nan():
+    x = np.array([np.nan, 1.0, 2.0, 5.0, 5.0, 5.0])
+    y = np.array([1.0, 2.0, 4.0, 3.0, 3.0, 3.0])
+    r = sliding_pearson(x, y, 3)
+    # <2 pairs, then a perfect fit, then constant windows
+    assert np.isnan(r[:2]).all()
+    assert r[2] == pytest.approx(1.0)
+    assert np.isnan(r[5])
+
+
+def test_sliding_all_missing():
+    assert np.isnan(sliding_pearson([np.nan, np.nan], [1.0, 2.0], 2)).all()
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+
+def test_perfect_positive_correlation():
+    assert _full_window([1.0, 2.0, 3.0, 4.0], [10.0, 20.0, 30.0, 40.0]) == pytest.approx(1.0)
+
+
+def test_perfect_negative_correlation():
+    assert _full_window([1.0, 2.0, 3.0, 4.0], [8.0, 6.0, 4.0, 2.0]) == pytest.approx(-1.0)
+
+
+def test_result_is_bounded():
+    r = _full_window([0.1, 0.2, 0.3], [0.1, 0.2, 0.3])
+    assert -1.0 <= r <= 1.0
+
+
+def test_accepts_lists_and_tuples():
+    assert _full_window((1.0, 2.0, 4.0), [2.0, 4.0, 8.0]) == pytest.approx(1.0)
+
+
+def test_sliding_matches_reference_per_window():
+    rng = np.random.default_rng(1)
+    x = rng.normal(500.0, 200.0, size=192)
+    y = 1000.0 + 0.05 * x + rng.normal(0.0, 20.0, size=192)
+    x[rng.random(192) < 0.2] = np.nan
+    y[rng.random(192) < 0.2] = np.nan
+
+    r = sliding_pearson(x, y, 96)
+
+    for i in range(192):
+        lo = max(0, i - 95)
+        expected = _reference_pearson(x[lo:i + 1], y[lo:i + 1])
+        if np.isnan(expected):
+            assert np.isnan(r[i])
+        else:
+            assert r[i] == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,83 @@
+"""Tests for lib.ttl_cache.TTLCache."""
+
+import pytest
+
+from lib.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+# ---------------------------------------------------------------------------
+# Construction / validation
+# ---------------------------------------------------------------------------
+
+
+def test_invalid_ttl():
+    with pytest.raises(ValueError, match="ttl must be positive"):
+        TTLCache(ttl=0)
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError, match="maxsize must be positive"):
+        TTLCache(ttl=1, maxsize=0)
+
+
+# ---------------------------------------------------------------------------
+# Expiry and eviction
+# ---------------------------------------------------------------------------
+
+
+def test_miss_returns_none(clock):
+    assert TTLCache(ttl=10, clock=clock).get("a") is None
+
+
+def test_hit_before_expiry(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+
+def test_expires_after_ttl(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_set_refreshes_expiry(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 8.0
+    cache.set("a", 2)
+    clock.now = 15.0
+    assert cache.get("a") == 2
+
+
+def test_evicts_oldest_when_full(clock):
+    cache = TTLCache(ttl=10, maxsize=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_clear(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
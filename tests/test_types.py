@@ -0,0 +1,43 @@
+"""Tests for lib.types.TimeSeries."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from lib.types import TimeSeries, TimeSeriesPoint
+
+
+def test_from_rows_builds_typed_columns():
+    rows = [
+        SimpleNamespace(timestamp=datetime(2026, 2, 25, 0, 0), power=1.5),
+        SimpleNamespace(timestamp=datetime(2026, 2, 25, 0, 15), power=2.5),
+    ]
+    series = TimeSeries.from_rows(rows, "power")
+    assert series.timestamps.dtype == np.dtype("datetime64[s]")
+    assert series.values.dtype == np.float64
+    assert series.values.tolist() == [1.5, 2.5]
+    assert len(series) == 2
+
+
+def test_from_rows_empty():
+    series = TimeSeries.from_rows([], "power")
+    assert len(series) == 0
+    assert series.to_points() == []
+
+
+def test_points_round_trip():
+    points = [
+        TimeSeriesPoint(timestamp=datetime(2026, 2, 25, 10, 0), value=1.0),
+        TimeSeriesPoint(timestamp=datetime(2026, 2, 25, 10, 15), value=3.0),
+    ]
+    assert TimeSeries.from_points(points).to_points() == points
+
+
+def test_from_columns():
+    series = TimeSeries.from_columns(
+        [datetime(2026, 2, 25, 0, 0), datetime(2026, 2, 25, 0, 15)], [1.0, 2.0]
+    )
+    assert series.timestamps.dtype == np.dtype("datetime64[s]")
+    assert series.values.tolist() == [1.0, 2.0]
+    assert len(TimeSeries.from_columns([], [])) == 0